@@ -1,21 +1,13 @@
+import os
 import sys
-from FileHandler import FileHandler
-from twoPL import TwoPL
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 
-# Main program
-def main():
-    if len(sys.argv) != 2:
-        raise Exception('Usage : python3 main.py <filename>')
-   
-    transactions = FileHandler(sys.argv[1]).lines
-    print(f"\nSet of transaction read from {sys.argv[1]}:")
-    print(transactions)
-    for i in range(len(transactions)) :
-        transactions[i] = transactions[i].strip()
-    twoPhase = TwoPL()
-    twoPhase.simulate(transactions)
+from dbcc.__main__ import main
+from dbcc.twopl.twoPL import POLICIES
 
+# Kept so python main.py test/test1.txt [policy] still works, same as python -m dbcc --protocol 2pl
 if __name__ == "__main__":
-    print("--- Simulating Two Phase Locking on DB ---")
-    print(f"\nResult from Two Phase Locking Protocol: ")
-    main()
\ No newline at end of file
+    args = sys.argv[1:]
+    if len(args) > 1 and args[1] in POLICIES:
+        args = [args[0], '--policy', args[1]] + args[2:]
+    main(['--protocol', '2pl'] + args)
@@ -0,0 +1,86 @@
+'''
+    Memory benchmark for the objects the OCC and MVCC simulators keep per operation, version, transaction
+    and item written to an OCC workspace
+    Every object is built the way the simulators build it and measured with tracemalloc
+
+    usage: python benchmarks/memory.py [-n COUNT]
+'''
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from dbcc.Parser import COMMIT, READ, WRITE, ItemTable, ScheduleOp
+from dbcc.mvcc import Lib as mvcc
+from dbcc.occ import Lib as occ
+from dbcc.occ.Store import KeyValueStore, Workspace
+
+ITEMS = 1000
+OPS_PER_TRANSACTION = 5
+
+def schedule(count: int, items: ItemTable):
+    '''
+        Build count parsed operations, transactions of reads and writes closed by a commit
+        params:
+        count = number of operations
+        items = item table the item names are interned in
+    '''
+    ids = [items.intern(f'Item{i}') for i in range(ITEMS)]
+    ops = []
+    for i in range(count):
+        t_num = i // OPS_PER_TRANSACTION + 1
+        if i % OPS_PER_TRANSACTION == OPS_PER_TRANSACTION - 1:
+            ops.append(ScheduleOp(COMMIT, t_num, None, i))
+        else:
+            ops.append(ScheduleOp(READ if i % 2 else WRITE, t_num, ids[i % ITEMS], i))
+    return ops
+
+def measure(count: int, build):
+    '''
+        Average bytes allocated by build(i) over count calls, the objects are kept alive while measuring
+        params:
+        count = number of objects
+        build = function creating the i-th object
+    '''
+    kept = [None] * count
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i in range(count):
+        kept[i] = build(i)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / count
+
+def new_version(lib, label: str, i: int):
+    '''
+        Version as MVCC.process_write creates it
+    '''
+    return lib.TransactionItem(label, version = i, read_ts = i, write_ts = i, writer = i)
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure bytes per operation, version and transaction')
+    parser.add_argument('-n', '--count', type=int, default=200000, help='objects built per measurement')
+    args = parser.parse_args()
+
+    items = ItemTable()
+    ops = schedule(args.count, items)
+    labels = [items.name(i % ITEMS) for i in range(ITEMS)]
+    # Distinct names so every write adds a key to the workspace
+    keys = [f'Key{i}' for i in range(args.count)]
+    workspace = Workspace(KeyValueStore())
+
+    results = [
+        ('occ operation', measure(args.count, lambda i: occ.Operation(ops[i], items))),
+        ('occ transaction', measure(args.count, lambda i: occ.OCCTransaction(i))),
+        ('occ written item', measure(args.count, lambda i: workspace.write(keys[i], i))),
+        ('mvcc operation', measure(args.count, lambda i: mvcc.Operation(ops[i], items))),
+        ('mvcc version', measure(args.count, lambda i: new_version(mvcc, labels[i % ITEMS], i))),
+        ('mvcc transaction', measure(args.count, lambda i: mvcc.MVCCTransaction(i, i))),
+    ]
+    for (name, size) in results:
+        print(f'{name:<17}: {size:7.1f} bytes')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+'''
+    OCC write phase benchmark, the same synthetic workload is run over stores preloaded with more and more items
+    and transactions writing more and more items. Reports throughput, the time spent installing validated
+    workspaces in the store per item written, and the store size
+
+    usage: python benchmarks/occ_store.py [-t TRANSACTIONS] [--sizes N ...] [--ops N ...] [-o results.json]
+'''
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from dbcc.Events import EventSink
+from dbcc.occ.Occ import OCC
+from dbcc.occ.Store import KeyValueStore
+from dbcc.Parser import ItemTable
+from dbcc.Workload import Workload
+
+class TimedOCC(OCC):
+    '''
+    Class TimedOCC, OCC timing its write phase
+    '''
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.write_s = 0.0
+
+    def write(self, op):
+        start = time.perf_counter()
+        super().write(op)
+        self.write_s += time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the OCC write phase as the store and the write sets grow')
+    parser.add_argument('-t', '--transactions', type=int, default=20000, help='transactions per run')
+    parser.add_argument('--ops', type=int, nargs='+', default=[2, 8, 32], help='reads and writes per transaction to sweep')
+    parser.add_argument('-r', '--read-ratio', type=float, default=0.5, help='probability that an operation is a read')
+    parser.add_argument('-i', '--items', type=int, default=10000, help='number of distinct items the workload touches')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[0, 100000, 1000000],
+                        help='items preloaded in the store before each run')
+    parser.add_argument('-c', '--concurrency', type=int, default=8, help='transactions interleaved at once')
+    parser.add_argument('--seed', type=int, default=0, help='random seed of the workload')
+    parser.add_argument('-o', '--output', help='write the results as JSON to this file')
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'preloaded':>10} {'ops/tx':>6} {'ops/s':>10} {'commits':>8} {'installed':>10} {'ns/key':>8} {'keys':>9}")
+    for size in args.sizes:
+        preloaded = {f"Item{i}": 0 for i in range(size)}
+        for ops in args.ops:
+            workload = Workload(args.transactions, ops, args.read_ratio, args.items, 0.0, args.concurrency, args.seed)
+            items = ItemTable()
+            operations = list(workload.operations(items))
+            engine = TimedOCC(EventSink(), items=items, store=KeyValueStore(preloaded))
+            start = time.perf_counter()
+            stats = engine.run(operations)
+            wall = time.perf_counter() - start
+            per_key = engine.write_s / stats['installed'] * 1e9 if stats['installed'] else 0.0
+            stats.update(preloaded=size, ops_per_transaction=ops, transactions=args.transactions,
+                         wall_s=round(wall, 6), ops_per_s=round(len(operations) / wall), write_ns_per_key=round(per_key, 1))
+            results.append(stats)
+            print(f"{size:>10} {ops:>6} {stats['ops_per_s']:>10} {stats['commits']:>8} {stats['installed']:>10} "
+                  f"{per_key:8.0f} {stats['keys']:>9}")
+
+    if args.output:
+        with open(args.output, 'w') as stream:
+            json.dump(results, stream, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+'''
+    Throughput benchmark running 2PL, OCC and MVCC in-process on the same synthetic workloads
+    Every protocol is run once per contention level for the timing, and once more under tracemalloc for the peak memory
+    2PL is run once per deadlock policy and lock release variant, so wound-wait, wait-die and deadlock detection,
+    and basic, strict and rigorous 2PL are compared as well
+
+    usage: python benchmarks/protocols.py [-t TRANSACTIONS] [--skew S ...] [--policies P ...] [--variants V ...] [-o results.json]
+'''
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from dbcc.Engine import PROTOCOL_2PL, PROTOCOLS, make_engine
+from dbcc.Events import CounterSink
+from dbcc.Workload import Workload
+from dbcc.twopl.twoPL import POLICIES, RIGOROUS, VARIANTS, VICTIM_OPS, VICTIMS, count_operations
+
+def feed(engine, workload: Workload):
+    '''
+        Submit the workload to an engine and finish it.
+        Return the transactions left waiting after each operation, summed, in transaction-operations
+        params:
+        engine = ConcurrencyControl engine
+        workload = schedule to run
+    '''
+    wait = 0
+    for op in workload.operations(engine.items):
+        engine.submit(op)
+        wait += engine.waiting()
+    engine.finish()
+    return wait
+
+def run(protocol: str, workload: Workload, memory: bool, options: dict):
+    '''
+        Run one protocol on one workload and collect its metrics
+        params:
+        protocol = one of PROTOCOLS
+        workload = schedule to run
+        memory = also run it under tracemalloc for the peak memory
+        options = engine settings, example the 2PL policy
+    '''
+    engine = make_engine(protocol, CounterSink(), **options)
+    start = time.perf_counter()
+    wait = feed(engine, workload)
+    wall = time.perf_counter() - start
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        feed(make_engine(protocol, CounterSink(), **options), workload)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    stats = engine.stats()
+    result = {
+        'protocol': protocol,
+        'ops': stats['ops'],
+        'wall_s': round(wall, 4),
+        'ops_per_s': round(stats['ops'] / wall) if wall else None,
+        'peak_bytes': peak,
+        'commits': stats['commits'],
+        'aborts': stats['aborts'],
+        'restarts': stats['restarts'],
+        'wait': wait,
+    }
+    if protocol == PROTOCOL_2PL:
+        result.update(lock_hold=stats['lock_hold'], lock_wait=stats['lock_wait'])
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare 2PL, OCC and MVCC on the same workloads')
+    parser.add_argument('-p', '--protocols', nargs='+', default=list(PROTOCOLS), choices=PROTOCOLS)
+    parser.add_argument('-t', '--transactions', type=int, default=2000, help='transactions per workload')
+    parser.add_argument('-n', '--ops', type=int, default=4, help='reads and writes per transaction')
+    parser.add_argument('-r', '--read-ratio', type=float, default=0.5, help='probability that an operation is a read')
+    parser.add_argument('-i', '--items', type=int, default=100, help='number of distinct items')
+    parser.add_argument('-c', '--concurrency', type=int, default=8, help='transactions interleaved at once')
+    parser.add_argument('-s', '--skew', type=float, nargs='+', default=[0.0, 0.5, 1.0, 1.5],
+                        help='Zipfian skews to sweep, higher is more contention')
+    parser.add_argument('--policies', nargs='+', default=list(POLICIES), choices=POLICIES,
+                        help='2PL deadlock policies, 2PL is run once per policy')
+    parser.add_argument('--variants', nargs='+', default=[RIGOROUS], choices=VARIANTS,
+                        help='2PL lock release variants, 2PL is run once per policy and variant')
+    parser.add_argument('--victim', default=VICTIM_OPS, choices=VICTIMS, help='deadlock victim cost of the detect policy')
+    parser.add_argument('--seed', type=int, default=0, help='random seed of the workloads')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc run for the peak memory')
+    parser.add_argument('-o', '--output', help='write the results as JSON to this file')
+    args = parser.parse_args()
+
+    results = []
+    # The 2PL history is only needed for its final result, which is never printed here
+    runs = [(f"{protocol}/{policy}" + (f"/{variant}" if variant != RIGOROUS else ""), protocol,
+             {'policy': policy, 'victim': args.victim, 'variant': variant, 'record_history': False})
+            for protocol in args.protocols if protocol == PROTOCOL_2PL for policy in args.policies for variant in args.variants]
+    runs += [(protocol, protocol, {}) for protocol in args.protocols if protocol != PROTOCOL_2PL]
+    print(f"{'skew':>5} {'protocol':<21} {'ops/s':>10} {'wall s':>8} {'peak KiB':>9} {'commits':>8} {'aborts':>8} {'restarts':>8} {'wait':>9} {'hold':>6}")
+    for skew in args.skew:
+        workload = Workload(args.transactions, args.ops, args.read_ratio, args.items, skew, args.concurrency, args.seed)
+        if any(options.get('variant', RIGOROUS) != RIGOROUS for (label, protocol, options) in runs):
+            # Basic and strict 2PL release locks at the lock point, known from a first pass over the same workload
+            lock_points = count_operations(workload.operations())
+            for (label, protocol, options) in runs:
+                if options.get('variant', RIGOROUS) != RIGOROUS:
+                    options['lock_points'] = lock_points
+        for (label, protocol, options) in runs:
+            result = run(protocol, workload, not args.no_memory, options)
+            result.update(label=label, policy=options.get('policy'), variant=options.get('variant'), skew=skew, transactions=args.transactions, ops_per_transaction=args.ops,
+                          read_ratio=args.read_ratio, items=args.items, concurrency=args.concurrency, seed=args.seed)
+            results.append(result)
+            hold = f"{result['lock_hold']['mean']:6.2f}" if result.get('lock_hold', {}).get('mean') is not None else f"{'-':>6}"
+            peak = f"{result['peak_bytes'] / 1024:9.0f}" if result['peak_bytes'] is not None else f"{'-':>9}"
+            print(f"{skew:5.2f} {label:<21} {result['ops_per_s']:>10} {result['wall_s']:8.3f} {peak} "
+                  f"{result['commits']:>8} {result['aborts']:>8} {result['restarts']:>8} {result['wait']:>9} {hold}")
+
+    if args.output:
+        with open(args.output, 'w') as stream:
+            json.dump(results, stream, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+'''
+    Live 2PL benchmark, every transaction of a synthetic workload runs on a pool of worker threads
+    that really block on lock conflicts, swept over the thread count and the deadlock policies.
+    Reports throughput and the real lock wait and hold time, in microseconds
+
+    usage: python benchmarks/threads.py [-t TRANSACTIONS] [--threads N ...] [--think MS] [-o results.json]
+'''
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from dbcc.Parser import ItemTable
+from dbcc.Workload import Workload
+from dbcc.twopl.LiveTwoPL import LiveTwoPL, transaction_programs
+from dbcc.twopl.twoPL import POLICIES, VICTIM_OPS, VICTIMS
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure live 2PL throughput and lock wait as the thread count grows')
+    parser.add_argument('-t', '--transactions', type=int, default=1000, help='transactions per run')
+    parser.add_argument('-n', '--ops', type=int, default=4, help='reads and writes per transaction')
+    parser.add_argument('-r', '--read-ratio', type=float, default=0.5, help='probability that an operation is a read')
+    parser.add_argument('-i', '--items', type=int, default=100, help='number of distinct items')
+    parser.add_argument('-s', '--skew', type=float, default=1.0, help='Zipfian skew, higher is more contention')
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8, 16], help='worker thread counts to sweep')
+    parser.add_argument('--think', type=float, default=0.1,
+                        help='milliseconds a transaction works after each operation, it sleeps so other threads can run')
+    parser.add_argument('--policies', nargs='+', default=list(POLICIES), choices=POLICIES, help='2PL deadlock policies')
+    parser.add_argument('--victim', default=VICTIM_OPS, choices=VICTIMS, help='deadlock victim cost of the detect policy')
+    parser.add_argument('--seed', type=int, default=0, help='random seed of the workload')
+    parser.add_argument('-o', '--output', help='write the results as JSON to this file')
+    args = parser.parse_args()
+
+    # Only the transactions matter, the interleaving of the workload comes from the threads
+    workload = Workload(args.transactions, args.ops, args.read_ratio, args.items, args.skew, 1, args.seed)
+    items = ItemTable()
+    programs = transaction_programs(workload.operations(items))
+
+    results = []
+    print(f"{'policy':<11} {'threads':>7} {'commits/s':>10} {'wall s':>8} {'aborts':>8} {'waits':>7} "
+          f"{'wait us':>9} {'max wait':>9} {'hold us':>9}")
+    for policy in args.policies:
+        for threads in args.threads:
+            engine = LiveTwoPL(policy, args.victim, items=items)
+            stats = engine.run(programs, threads, args.think / 1000)
+            stats.update(transactions=args.transactions, ops_per_transaction=args.ops, read_ratio=args.read_ratio,
+                         items=args.items, skew=args.skew, think_ms=args.think, seed=args.seed)
+            results.append(stats)
+            wait = stats['lock_wait_us']
+            mean = f"{wait['mean']:9.0f}" if wait['mean'] is not None else f"{'-':>9}"
+            print(f"{policy:<11} {threads:>7} {stats['commits_per_s']:>10} {stats['wall_s']:8.3f} {stats['aborts']:>8} "
+                  f"{wait['count']:>7} {mean} {wait['max']:>9} {stats['lock_hold_us']['mean']:9.0f}")
+
+    if args.output:
+        with open(args.output, 'w') as stream:
+            json.dump(results, stream, indent=2)
+
+if __name__ == '__main__':
+    main()
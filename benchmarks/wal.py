@@ -0,0 +1,86 @@
+'''
+    Write-ahead log benchmark, committer threads append commit records and wait until they are synced,
+    swept over the group size and group delay. Reports commits/s, fsyncs, the mean group and the
+    commit latency percentiles in microseconds
+
+    usage: python benchmarks/wal.py [-c COMMITS] [--threads N] [--sizes N ...] [--delays MS ...] [-o results.json]
+'''
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from dbcc.Wal import WriteAheadLog
+
+def committer(wal: WriteAheadLog, commits: int, writes: int, first: int, latencies: list):
+    '''
+        Log commits one after the other, each waits for its record to be synced
+        params:
+        wal = log
+        commits = commits of this thread
+        writes = items written per commit
+        first = id of the first transaction of this thread
+        latencies = where the commit latencies in seconds are added
+    '''
+    for t_num in range(first, first + commits):
+        record = {'t': t_num, 'w': {f"Item{(t_num + i) % 1000}": t_num for i in range(writes)}}
+        start = time.perf_counter()
+        wal.wait(wal.append(record))
+        latencies.append(time.perf_counter() - start)
+
+def percentile(values: list, q: float) -> float:
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure commit latency and throughput as fsyncs are batched')
+    parser.add_argument('-c', '--commits', type=int, default=4000, help='commits per run, over every thread')
+    parser.add_argument('--threads', type=int, default=32, help='committer threads')
+    parser.add_argument('-n', '--writes', type=int, default=4, help='items written per commit')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 8, 64], help='group sizes to sweep')
+    parser.add_argument('--delays', type=float, nargs='+', default=[0, 1, 5], help='group delays in milliseconds to sweep')
+    parser.add_argument('--dir', default=None, help='directory of the log files (default a temporary one)')
+    parser.add_argument('-o', '--output', help='write the results as JSON to this file')
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'size':>5} {'delay ms':>8} {'commits/s':>10} {'fsyncs':>7} {'group':>7} {'p50 us':>9} {'p99 us':>9} {'max us':>9}")
+    with tempfile.TemporaryDirectory(dir=args.dir) as directory:
+        for size in args.sizes:
+            for delay in args.delays:
+                path = os.path.join(directory, f"wal-{size}-{delay}.log")
+                wal = WriteAheadLog(path, size, delay / 1000, flush_on_append=False)
+                latencies: list[float] = []
+                per_thread = args.commits // args.threads
+                threads = [threading.Thread(target=committer, args=(wal, per_thread, args.writes, i * per_thread + 1, latencies))
+                           for i in range(args.threads)]
+                start = time.perf_counter()
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                wall = time.perf_counter() - start
+                wal.close()
+                stats = wal.stats()
+                latencies.sort()
+                result = {
+                    'group_size': size, 'group_delay_ms': delay, 'threads': args.threads, 'commits': len(latencies),
+                    'wall_s': round(wall, 6), 'commits_per_s': round(len(latencies) / wall, 1),
+                    'fsyncs': stats['fsyncs'], 'mean_group': stats['group']['mean'],
+                    'p50_us': round(percentile(latencies, 0.50) * 1e6), 'p99_us': round(percentile(latencies, 0.99) * 1e6),
+                    'max_us': round(latencies[-1] * 1e6), 'sync_us': stats['sync_us'],
+                }
+                results.append(result)
+                print(f"{size:>5} {delay:>8g} {result['commits_per_s']:>10} {result['fsyncs']:>7} {result['mean_group']:>7} "
+                      f"{result['p50_us']:>9} {result['p99_us']:>9} {result['max_us']:>9}")
+
+    if args.output:
+        with open(args.output, 'w') as stream:
+            json.dump(results, stream, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+from typing import Iterable
+
+from dbcc.Engine import PROTOCOL_2PL, PROTOCOLS, make_engine
+from dbcc.Events import EventSink
+from dbcc.FileHandler import FileHandler
+from dbcc.Parser import ScheduleParseError, ScheduleParser
+from dbcc.twopl.twoPL import POLICIES, RIGOROUS, VARIANTS, WOUND_WAIT, count_operations
+
+
+class SerialOrderSink(EventSink):
+    '''
+    Class SerialOrderSink, records the equivalent serial order from the commit events and drops everything else
+    A commit carrying a timestamp (MVCC) is placed by its timestamp, any other by when it committed,
+    a transaction committed again after a cascading rollback takes its last place
+    '''
+    def __init__(self):
+        '''
+            Initiate needed variables
+            order = transaction id to its sort key
+        '''
+        self.order: dict[int, int] = {}
+        self.commits = 0
+
+    def emit(self, event: str, **fields):
+        if event == "commit" and fields.get("success", True):
+            self.commits += 1
+            self.order[fields["t_num"]] = fields.get("timestamp", self.commits)
+
+    def serial_order(self) -> list[int]:
+        '''
+            Committed transaction ids in the equivalent serial order
+        '''
+        return sorted(self.order, key=self.order.get)
+
+
+def schedule_files(paths: Iterable[str]) -> list[str]:
+    '''
+        Expand directories and glob patterns into the sorted list of schedule files
+        params:
+        paths = files, directories (every .txt below them) or glob patterns
+    '''
+    files = set()
+    for path in paths:
+        if os.path.isdir(path):
+            files.update(glob.glob(os.path.join(path, '**', '*.txt'), recursive=True))
+        elif os.path.isfile(path):
+            files.add(path)
+        else:
+            files.update(match for match in glob.glob(path, recursive=True) if os.path.isfile(match))
+    return sorted(files)
+
+def run_file(task: tuple) -> list[dict]:
+    '''
+        Run every protocol on one schedule file with the events dropped, one result per protocol
+        params:
+        task = (path, protocols, 2PL policy, 2PL variant)
+    '''
+    (path, protocols, policy, variant) = task
+    results = []
+    for protocol in protocols:
+        result = {'file': path, 'protocol': protocol}
+        sink = SerialOrderSink()
+        options = {'policy': policy, 'variant': variant, 'record_history': False} if protocol == PROTOCOL_2PL else {}
+        start = time.perf_counter()
+        try:
+            if protocol == PROTOCOL_2PL and variant != RIGOROUS:
+                options['lock_points'] = count_operations(FileHandler(path).operations(ScheduleParser()))
+            engine = make_engine(protocol, sink, **options)
+            stats = engine.run(FileHandler(path).operations(engine.parser))
+            result.update(serial_order=sink.serial_order(), commits=stats['commits'],
+                          aborts=stats['aborts'], restarts=stats['restarts'], ops=stats['ops'])
+        except (ScheduleParseError, OSError) as e:
+            result['error'] = str(e)
+        except Exception as e:
+            # One bad schedule, such as a 2PL lock point that does not match it, must not end the whole batch
+            result['error'] = f"{type(e).__name__} : {e}"
+        result['wall_s'] = round(time.perf_counter() - start, 6)
+        results.append(result)
+    return results
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog='python -m dbcc.Batch', description='Run many schedule files in parallel')
+    parser.add_argument('paths', nargs='+', help='schedule files, directories or glob patterns')
+    parser.add_argument('-p', '--protocols', nargs='+', default=list(PROTOCOLS), choices=PROTOCOLS)
+    parser.add_argument('--policy', default=WOUND_WAIT, choices=POLICIES, help='2PL deadlock handling')
+    parser.add_argument('--variant', default=RIGOROUS, choices=VARIANTS, help='2PL lock release')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help='worker processes (default every core)')
+    parser.add_argument('-o', '--output', default='-', help='JSON lines result file, - for stdout')
+    args = parser.parse_args(argv)
+
+    files = schedule_files(args.paths)
+    tasks = [(path, args.protocols, args.policy, args.variant) for path in files]
+    # Big chunks keep the inter-process traffic per file low
+    chunksize = max(1, len(tasks) // (args.jobs * 4))
+    stream = sys.stdout if args.output == '-' else open(args.output, 'w')
+    failed = 0
+    try:
+        with Pool(args.jobs) as pool:
+            for results in pool.imap(run_file, tasks, chunksize):
+                for result in results:
+                    failed += 'error' in result
+                    stream.write(json.dumps(result) + "\n")
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+    print(f"{len(files)} schedules, {len(tasks) * len(args.protocols)} runs, {failed} failed", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Iterable, Optional, Union
+
+from dbcc.Events import EventSink
+from dbcc.Parser import ItemTable, ScheduleOp, ScheduleParser
+
+PROTOCOL_2PL = '2pl'
+PROTOCOL_OCC = 'occ'
+PROTOCOL_MVCC = 'mvcc'
+PROTOCOLS = (PROTOCOL_2PL, PROTOCOL_OCC, PROTOCOL_MVCC)
+
+
+class Histogram:
+    '''
+    Class Histogram, counts non negative durations in power of two buckets: 0, 1, 2-3, 4-7, ...
+    Memory stays fixed however many values are added
+    '''
+    __slots__ = ('buckets', 'count', 'total', 'max')
+
+    def __init__(self):
+        '''
+            Initiate needed variables
+            buckets = bit length of the value to how many values fell in its bucket
+        '''
+        self.buckets: Counter = Counter()
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def add(self, value: int):
+        '''
+            Count one duration
+            params:
+            value = duration, in logical time
+        '''
+        self.buckets[value.bit_length()] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def summary(self) -> dict:
+        '''
+            Count, mean, max and the non empty buckets labelled by their range, ready for JSON
+        '''
+        buckets = {}
+        for bits in sorted(self.buckets):
+            low = 1 << (bits - 1) if bits else 0
+            high = (1 << bits) - 1
+            buckets[str(low) if low == high else f"{low}-{high}"] = self.buckets[bits]
+        return {
+            'count': self.count,
+            'mean': round(self.total / self.count, 3) if self.count else None,
+            'max': self.max,
+            'buckets': buckets,
+        }
+
+
+class ConcurrencyControl(ABC):
+    '''
+    Class ConcurrencyControl, common interface of the 2PL, OCC and MVCC engines
+    Operations are submitted one at a time, finish ends the schedule and stats reports what happened
+    '''
+    # Protocol name, one of PROTOCOLS
+    name = None
+
+    def __init__(self, sink: Optional[EventSink] = None, items: Optional[ItemTable] = None):
+        '''
+            Initiate needed variables
+            params:
+            sink = receiver of the simulation events, every event is dropped if not given
+            items = item table the operations are interned in, a new one is created if not given
+            counts = operations, commits, aborts and restarts so far
+        '''
+        self.sink = sink if sink is not None else EventSink()
+        self.items = items if items is not None else ItemTable()
+        self.parser = ScheduleParser(self.items)
+        self.counts: Counter = Counter()
+
+    def parse(self, op: Union[ScheduleOp, str]) -> ScheduleOp:
+        '''
+            Accept an operation either parsed with self.items or as text, example R1(A)
+            params:
+            op = operation
+        '''
+        if isinstance(op, str):
+            return self.parser.parse_op(op)
+        return op
+
+    @abstractmethod
+    def submit(self, op: Union[ScheduleOp, str]) -> bool:
+        '''
+            Process the next operation of the schedule
+            Return True if it ran right away, False if it was queued, deferred or caused an abort
+            params:
+            op = operation
+        '''
+
+    @abstractmethod
+    def finish(self):
+        '''
+            End the schedule, whatever is still pending is settled and done is emitted
+        '''
+
+    @abstractmethod
+    def abort(self, t_num: int):
+        '''
+            Roll back a running transaction for good, as when its client goes away.
+            Its pending operations are dropped and it is not restarted, it counts as an abort
+            params:
+            t_num = transaction id, a committed or unknown transaction is left alone
+        '''
+
+    def waiting(self) -> int:
+        '''
+            Number of transactions currently waiting before they can go on
+        '''
+        return 0
+
+    def blocked(self, t_num: int) -> bool:
+        '''
+            Whether operations submitted for a transaction are still waiting, for a lock or a restart.
+            They run during a later submit or finish
+            params:
+            t_num = transaction id
+        '''
+        return False
+
+    def stats(self) -> dict:
+        '''
+            Counters of the schedule so far
+        '''
+        return {
+            'protocol': self.name,
+            'ops': self.counts['ops'],
+            'commits': self.counts['commits'],
+            'aborts': self.counts['aborts'],
+            'restarts': self.counts['restarts'],
+            'waiting': self.waiting(),
+        }
+
+    def run(self, operations: Iterable[Union[ScheduleOp, str]]) -> dict:
+        '''
+            Submit every operation, finish the schedule and return the stats
+            params:
+            operations = schedule, example FileHandler.operations(self.parser)
+        '''
+        for op in operations:
+            self.submit(op)
+        self.finish()
+        return self.stats()
+
+
+def make_engine(protocol: str, sink: Optional[EventSink] = None, items: Optional[ItemTable] = None,
+                **options) -> ConcurrencyControl:
+    '''
+        Build the engine of a protocol
+        params:
+        protocol = one of PROTOCOLS
+        sink = receiver of the simulation events, the protocol console output if not given
+        items = item table the operations are interned in
+        options = protocol specific settings, example policy for 2PL or vacuum_threshold for MVCC
+    '''
+    if protocol == PROTOCOL_2PL:
+        from dbcc.twopl.twoPL import TwoPL
+        return TwoPL(items=items, sink=sink, **options)
+    if protocol == PROTOCOL_OCC:
+        from dbcc.occ.Occ import OCC
+        return OCC(sink, items=items, **options)
+    if protocol == PROTOCOL_MVCC:
+        from dbcc.mvcc.Mvcc import MVCC
+        return MVCC(sink, items=items, **options)
+    raise ValueError(f"Unknown protocol : {protocol}")
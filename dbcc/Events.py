@@ -0,0 +1,125 @@
+import json
+import sys
+from collections import Counter
+from typing import Callable, Optional, TextIO
+
+CONSOLE = 'console'
+JSON = 'json'
+COUNTERS = 'counters'
+QUIET = 'quiet'
+SINKS = (CONSOLE, JSON, COUNTERS, QUIET)
+
+
+class EventSink:
+    '''
+    Class EventSink, receives the events emitted by a protocol simulation
+    The base class drops every event, so it doubles as the no-op sink for benchmarks
+    '''
+    # Engines only build state dumps (queue, lock table, ...) for verbose sinks
+    verbose = False
+
+    def emit(self, event: str, **fields):
+        '''
+            Receive one event
+            params:
+            event = event name, example read or commit
+            fields = event payload, example t_num and item
+        '''
+        pass
+
+    def close(self):
+        '''
+            Flush whatever the sink still holds
+        '''
+        pass
+
+
+class CounterSink(EventSink):
+    '''
+    Class CounterSink, only counts events per name
+    '''
+    def __init__(self, stream: Optional[TextIO] = None):
+        '''
+            Initiate needed variables
+            params:
+            stream = where close writes the counters, nothing is written if not given
+        '''
+        self.counts: Counter = Counter()
+        self.stream = stream
+
+    def emit(self, event: str, **fields):
+        self.counts[event] += 1
+
+    def close(self):
+        if self.stream is not None:
+            for event, count in sorted(self.counts.items()):
+                self.stream.write(f"{event}: {count}\n")
+
+
+class JsonLinesSink(EventSink):
+    '''
+    Class JsonLinesSink, writes one JSON object per event
+    '''
+    def __init__(self, stream: TextIO):
+        '''
+            Initiate needed variables
+            params:
+            stream = where the JSON lines are written
+        '''
+        self.stream = stream
+
+    def emit(self, event: str, **fields):
+        self.stream.write(json.dumps({"event": event, **fields}, default=_to_json) + "\n")
+
+    def close(self):
+        self.stream.flush()
+
+
+class ConsoleSink(EventSink):
+    '''
+    Class ConsoleSink, human readable colored output
+    '''
+    verbose = True
+
+    def __init__(self, formatter: Callable[[str, dict], Optional[str]], stream: Optional[TextIO] = None):
+        '''
+            Initiate needed variables
+            params:
+            formatter = turns an event and its fields into the text to print, None to print nothing
+            stream = where the text is printed, stdout if not given
+        '''
+        self.formatter = formatter
+        self.stream = stream
+
+    def emit(self, event: str, **fields):
+        text = self.formatter(event, fields)
+        if text is not None:
+            print(text, file=self.stream if self.stream is not None else sys.stdout)
+
+
+def _to_json(value):
+    '''
+        Fallback JSON encoding for sets and engine objects
+    '''
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    return str(value)
+
+
+def make_sink(name: str, formatter: Callable[[str, dict], Optional[str]], stream: TextIO = sys.stdout) -> EventSink:
+    '''
+        Build a sink from its command line name
+        params:
+        name = one of SINKS
+        formatter = console formatter of the protocol
+        stream = output stream
+    '''
+    if name == CONSOLE:
+        return ConsoleSink(formatter, stream)
+    if name == JSON:
+        return JsonLinesSink(stream)
+    if name == COUNTERS:
+        return CounterSink(stream)
+    if name == QUIET:
+        return EventSink()
+    raise ValueError(f"Unknown sink : {name}")
@@ -0,0 +1,28 @@
+import sys
+from dbcc.Parser import ScheduleParser
+
+class FileHandler:
+    '''
+    Class FileHandler, stream schedule operations from a file, a pipe or stdin
+    '''
+    def __init__(self, filename):
+        '''
+            Remember the schedule source, it is only opened when operations are consumed
+            params:
+            filename = path to the schedule, or - to read from stdin
+        '''
+        self.filename = filename
+
+    def operations(self, parser: ScheduleParser):
+        '''
+            Lazily parse the schedule one line at a time.
+            The file stays open while the operations are consumed, and is closed once they are all read
+            or the generator is dropped
+            params:
+            parser = parser to intern the items with
+        '''
+        if self.filename == '-':
+            yield from parser.parse(sys.stdin)
+            return
+        with open(self.filename, 'r') as file:
+            yield from parser.parse(file)
@@ -0,0 +1,229 @@
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import sys
+import time
+from typing import Optional
+
+from dbcc.Server import HOST, LINE_LIMIT, PORT
+from dbcc.Workload import Workload
+
+SEQUENTIAL = 'sequential'
+PIPELINE = 'pipeline'
+BATCH = 'batch'
+MODES = (SEQUENTIAL, PIPELINE, BATCH)
+
+
+class Connection:
+    '''
+    Class Connection, one client connection shared by many sessions
+    Requests are tagged with an id and the answers, which may come in any order, are matched back to them
+    '''
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        '''
+            Initiate needed variables
+            params:
+            reader, writer = connection streams
+            pending = request id to the future of its answer
+        '''
+        self.reader = reader
+        self.writer = writer
+        self.pending: dict[int, asyncio.Future] = {}
+        self.ids = itertools.count(1)
+        self.reading = asyncio.ensure_future(self.read_answers())
+
+    @classmethod
+    async def open(cls, host: str = HOST, port: int = PORT, unix: Optional[str] = None) -> 'Connection':
+        '''
+            Connect to a TransactionServer
+            params:
+            host, port = TCP address
+            unix = Unix socket path, used instead of TCP when given
+        '''
+        if unix:
+            (reader, writer) = await asyncio.open_unix_connection(unix, limit=LINE_LIMIT)
+        else:
+            (reader, writer) = await asyncio.open_connection(host, port, limit=LINE_LIMIT)
+        return cls(reader, writer)
+
+    async def read_answers(self):
+        '''
+            Resolve the pending requests as their answers arrive, a batch is answered under the id of its first request
+        '''
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                break
+            answer = json.loads(line)
+            key = answer[0].get('id') if isinstance(answer, list) and answer else answer.get('id')
+            future = self.pending.pop(key, None)
+            if future is not None:
+                future.set_result(answer)
+        for future in self.pending.values():
+            future.set_exception(ConnectionError("The server closed the connection"))
+
+    def send(self, request) -> asyncio.Future:
+        '''
+            Send a request, or a list of them as one batch, without waiting for the answer
+            params:
+            request = request object, its id is filled in
+        '''
+        entries = request if isinstance(request, list) else [request]
+        for entry in entries:
+            entry['id'] = next(self.ids)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[entries[0]['id']] = future
+        self.writer.write(json.dumps(request).encode() + b"\n")
+        return future
+
+    async def request(self, request):
+        '''
+            Send a request and wait for its answer
+        '''
+        future = self.send(request)
+        await self.writer.drain()
+        return await future
+
+    async def close(self):
+        self.writer.close()
+        await self.reading
+
+
+class LoadGenerator:
+    '''
+    Class LoadGenerator, many client sessions each running transactions back to back against a TransactionServer
+    The latency of a transaction runs from its begin being sent until its commit is answered
+    '''
+    def __init__(self, workload: Workload, mode: str = SEQUENTIAL, seed: Optional[int] = None):
+        '''
+            Initiate needed variables
+            params:
+            workload = shape of the transactions, its transactions is the total over every session
+            mode = sequential waits for every answer, pipeline sends the operations of a transaction at once
+                   after its begin, batch sends the whole transaction as one request
+            seed = random seed of the operations
+            latencies = seconds of every transaction that committed
+        '''
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode : {mode}")
+        self.workload = workload
+        self.mode = mode
+        self.rng = random.Random(seed)
+        self.remaining = workload.transactions
+        self.latencies: list[float] = []
+        self.aborts = 0
+        self.errors = 0
+
+    def transaction(self) -> list[dict]:
+        '''
+            Draw the reads and writes of the next transaction, its commit included
+        '''
+        workload = self.workload
+        requests = []
+        for _ in range(workload.ops_per_transaction):
+            name = 'read' if self.rng.random() < workload.read_ratio else 'write'
+            requests.append({'op': name, 'item': f"Item{workload.item_rank(self.rng)}"})
+        requests.append({'op': 'commit'})
+        return requests
+
+    def record(self, start: float, answers: list[dict]):
+        '''
+            Account one finished transaction
+            params:
+            start = perf_counter when its begin was sent
+            answers = answers of its requests, commit last
+        '''
+        failed = [answer for answer in answers if not answer.get('ok')]
+        if failed:
+            self.errors += 1
+            if self.errors == 1:
+                print(f"First error : {failed[0].get('error')}", file=sys.stderr)
+            return
+        self.latencies.append(time.perf_counter() - start)
+        self.aborts += answers[-1].get('aborts', 0)
+
+    async def session(self, connection: Connection):
+        '''
+            Run transactions until the workload is used up
+            params:
+            connection = connection the session sends on
+        '''
+        while self.remaining > 0:
+            self.remaining -= 1
+            requests = self.transaction()
+            start = time.perf_counter()
+            if self.mode == BATCH:
+                answers = await connection.request([{'op': 'begin'}] + requests)
+            else:
+                begun = await connection.request({'op': 'begin'})
+                for request in requests:
+                    request['t'] = begun['t']
+                if self.mode == PIPELINE:
+                    futures = [connection.send(request) for request in requests]
+                    await connection.writer.drain()
+                    answers = list(await asyncio.gather(*futures))
+                else:
+                    answers = [await connection.request(request) for request in requests]
+            self.record(start, answers)
+
+    async def run(self, sessions: int, connections: int, host: str = HOST, port: int = PORT,
+                  unix: Optional[str] = None) -> dict:
+        '''
+            Open the connections, spread the sessions over them and report latency and throughput
+            params:
+            sessions = transactions running at once
+            connections = client connections, sessions share them round robin
+            host, port, unix = server address
+        '''
+        opened = [await Connection.open(host, port, unix) for _ in range(max(1, min(connections, sessions)))]
+        start = time.perf_counter()
+        await asyncio.gather(*(self.session(opened[index % len(opened)]) for index in range(sessions)))
+        wall = time.perf_counter() - start
+        server = await opened[0].request({'op': 'stats'})
+        for connection in opened:
+            await connection.close()
+
+        latencies = sorted(self.latencies)
+        def percentile(q: float) -> Optional[float]:
+            return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 3) if latencies else None
+        return {
+            'mode': self.mode,
+            'sessions': sessions,
+            'connections': len(opened),
+            'committed': len(latencies),
+            'errors': self.errors,
+            'aborts': self.aborts,
+            'wall_s': round(wall, 6),
+            'commits_per_s': round(len(latencies) / wall, 1) if wall else None,
+            'p50_ms': percentile(0.50),
+            'p99_ms': percentile(0.99),
+            'max_ms': round(latencies[-1] * 1000, 3) if latencies else None,
+            'server': server.get('stats'),
+        }
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog='python -m dbcc.Load', description='Drive a dbcc.Server with many concurrent sessions')
+    parser.add_argument('--host', default=HOST, help=f'TCP address (default {HOST})')
+    parser.add_argument('--port', type=int, default=PORT, help=f'TCP port (default {PORT})')
+    parser.add_argument('--unix', default=None, metavar='PATH', help='connect to a Unix socket instead of TCP')
+    parser.add_argument('-s', '--sessions', type=int, default=1000, help='transactions running at once')
+    parser.add_argument('-c', '--connections', type=int, default=64, help='connections the sessions share')
+    parser.add_argument('-t', '--transactions', type=int, default=20000, help='transactions over every session')
+    parser.add_argument('-n', '--ops', type=int, default=4, help='reads and writes per transaction, before its commit')
+    parser.add_argument('-r', '--read-ratio', type=float, default=0.5, help='probability that an operation is a read')
+    parser.add_argument('-i', '--items', type=int, default=1000, help='number of distinct items')
+    parser.add_argument('--skew', type=float, default=0.0, help='Zipfian skew of the item popularity, 0 is uniform')
+    parser.add_argument('-m', '--mode', default=SEQUENTIAL, choices=MODES,
+                        help='wait for every answer, pipeline a transaction after its begin, or send it as one batch')
+    parser.add_argument('--seed', type=int, default=None, help='random seed of the operations')
+    args = parser.parse_args(argv)
+
+    workload = Workload(args.transactions, args.ops, args.read_ratio, args.items, args.skew)
+    generator = LoadGenerator(workload, args.mode, args.seed)
+    print(json.dumps(asyncio.run(generator.run(args.sessions, args.connections, args.host, args.port, args.unix))))
+
+if __name__ == '__main__':
+    main()
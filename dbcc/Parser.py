@@ -0,0 +1,148 @@
+import re
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+READ = 'R'
+WRITE = 'W'
+COMMIT = 'C'
+# Starts a comment running to the end of the line
+COMMENT = '#'
+
+
+class ScheduleParseError(Exception):
+    '''
+    Class ScheduleParseError, raised when a schedule line is not a valid operation
+    '''
+    def __init__(self, line: int, text: str, reason: str):
+        '''
+            Initiate needed variables
+            params:
+            line = 1-based line number in the schedule
+            text = offending text
+            reason = why the text was rejected
+        '''
+        super().__init__(f"Line {line}: {reason}: {text!r}")
+        self.line = line
+        self.text = text
+        self.reason = reason
+
+
+class ItemTable:
+    '''
+    Class ItemTable, interns item names into dense integer ids
+    '''
+    def __init__(self):
+        '''
+            Initiate needed variables
+        '''
+        self.ids: dict[str, int] = {}
+        self.names: list[str] = []
+
+    def intern(self, name: str) -> int:
+        '''
+            Get the id of an item name, assigning the next id on first use
+            params:
+            name = item name, example A or Account42
+        '''
+        item = self.ids.get(name)
+        if item is None:
+            item = len(self.names)
+            self.ids[name] = item
+            self.names.append(name)
+        return item
+
+    def name(self, item: int) -> str:
+        '''
+            Get the item name of an interned id
+            params:
+            item = interned item id
+        '''
+        return self.names[item]
+
+    def __len__(self):
+        return len(self.names)
+
+
+class ScheduleOp(NamedTuple):
+    '''
+    Class ScheduleOp, one parsed operation of a schedule
+    kind = READ, WRITE or COMMIT
+    t_num = transaction number
+    item = interned item id, None for commit
+    line = line number the operation was read from
+    value = value written, None lets the engine pick one, only OCC keeps values
+    '''
+    kind: str
+    t_num: int
+    item: Optional[int]
+    line: int
+    value: object = None
+
+
+def format_op(op: ScheduleOp, items: ItemTable) -> str:
+    '''
+        Format an operation back to the schedule notation, example R1(A)
+        params:
+        op = parsed operation
+        items = table the operation items were interned in
+    '''
+    if op.item is None:
+        return f"{op.kind}{op.t_num}"
+    return f"{op.kind}{op.t_num}({items.name(op.item)})"
+
+
+class ScheduleParser:
+    '''
+    Class ScheduleParser, turns Rx(A); Wx(A); Cx schedules into ScheduleOp streams
+    '''
+    PATTERN = re.compile(r'([RWCrwc])(\d+)\s*(?:\(\s*(\w+)\s*\))?')
+
+    def __init__(self, items: Optional[ItemTable] = None):
+        '''
+            Initiate needed variables
+            params:
+            items = item table to intern into, a new one is created if not given
+        '''
+        self.items = items if items is not None else ItemTable()
+
+    def parse_op(self, text: str, line: int = 0) -> ScheduleOp:
+        '''
+            Parse a single operation
+            params:
+            text = operation text, example W10(Account42)
+            line = line number used for error reporting
+        '''
+        match = self.PATTERN.fullmatch(text)
+        if match is None:
+            raise ScheduleParseError(line, text, "invalid operation")
+        kind = match.group(1).upper()
+        name = match.group(3)
+        if kind == COMMIT:
+            if name is not None:
+                raise ScheduleParseError(line, text, "commit does not take an item")
+            return ScheduleOp(kind, int(match.group(2)), None, line)
+        if name is None:
+            raise ScheduleParseError(line, text, "read and write need an item")
+        return ScheduleOp(kind, int(match.group(2)), self.items.intern(name), line)
+
+    def parse_line(self, text: str, line: int = 0) -> list[ScheduleOp]:
+        '''
+            Parse every operation on a line, operations are separated by semicolons and a comment is skipped
+            params:
+            text = line content
+            line = line number used for error reporting
+        '''
+        ops = []
+        for part in text.split(COMMENT, 1)[0].split(";"):
+            part = part.strip()
+            if part:
+                ops.append(self.parse_op(part, line))
+        return ops
+
+    def parse(self, lines: Iterable[str]) -> Iterator[ScheduleOp]:
+        '''
+            Parse a schedule, blank lines and comments are skipped
+            params:
+            lines = schedule lines
+        '''
+        for number, text in enumerate(lines, 1):
+            yield from self.parse_line(text, number)
@@ -0,0 +1,221 @@
+import argparse
+import json
+import re
+from typing import Iterable, NamedTuple, Optional, Union
+
+from dbcc.FileHandler import FileHandler
+from dbcc.Parser import COMMENT, COMMIT, READ, ItemTable, ScheduleOp, ScheduleParser
+
+
+class SerializabilityResult(NamedTuple):
+    '''
+    Class SerializabilityResult, verdict of the checker
+    conflict_serializable = whether the precedence graph has no cycle
+    view_serializable = True or False, None when it cannot be decided without an exponential search
+    serial_order = equivalent serial order of the transactions when conflict serializable, else None
+    cycle = transactions of one precedence cycle, in edge order, else None
+    '''
+    conflict_serializable: bool
+    view_serializable: Optional[bool]
+    serial_order: Optional[list[int]]
+    cycle: Optional[list[int]]
+
+
+class PrecedenceGraph:
+    '''
+    Class PrecedenceGraph, precedence graph of a schedule built in one pass
+    Every item keeps its last writer and the readers since that write, so each operation only adds
+    the edges of the conflicts it closes instead of being compared with every earlier operation
+    '''
+    def __init__(self, committed: Optional[set[int]] = None):
+        '''
+            Initiate needed variables
+            params:
+            committed = transactions to keep, the committed projection of the schedule, every transaction if not given
+            edges = transaction to the transactions that must come after it
+            last_writer, readers = per item, the last writer and the transactions that read it since
+            blind_write = whether a transaction wrote an item it had not read before
+        '''
+        self.committed = committed
+        self.edges: dict[int, set[int]] = {}
+        self.last_writer: dict[object, int] = {}
+        self.readers: dict[object, set[int]] = {}
+        # Items read by each transaction still running, only kept to spot blind writes
+        self.reads: dict[int, set[object]] = {}
+        self.blind_write = False
+
+    def add_edge(self, before: int, after: int):
+        '''
+            Record that transaction before must come before transaction after
+        '''
+        if before != after:
+            self.edges[before].add(after)
+
+    def add(self, op: ScheduleOp):
+        '''
+            Add the next operation of the schedule
+            params:
+            op = parsed operation
+        '''
+        t_num = op.t_num
+        if self.committed is not None and t_num not in self.committed:
+            return
+        self.edges.setdefault(t_num, set())
+
+        if op.kind == COMMIT:
+            self.reads.pop(t_num, None)
+            return
+
+        item = op.item
+        writer = self.last_writer.get(item)
+        if op.kind == READ:
+            # Write-read conflict with the last writer
+            if writer is not None:
+                self.add_edge(writer, t_num)
+            self.readers.setdefault(item, set()).add(t_num)
+            self.reads.setdefault(t_num, set()).add(item)
+        else:
+            # Read-write conflicts with every reader since the last write, write-write with the last writer
+            for reader in self.readers.pop(item, ()):
+                self.add_edge(reader, t_num)
+            if writer is not None:
+                self.add_edge(writer, t_num)
+            self.last_writer[item] = t_num
+            if item not in self.reads.get(t_num, ()):
+                self.blind_write = True
+
+    def strongly_connected(self) -> list[list[int]]:
+        '''
+            Iterative Tarjan, the strongly connected components in reverse topological order
+        '''
+        index: dict[int, int] = {}
+        low: dict[int, int] = {}
+        on_stack: set[int] = set()
+        stack: list[int] = []
+        components: list[list[int]] = []
+
+        # Roots are taken latest first, so transactions with no order between them keep their schedule order
+        for root in reversed(list(self.edges)):
+            if root in index:
+                continue
+            # Explicit call stack of (node, iterator over its successors)
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self.edges[root]))]
+            while work:
+                (node, successors) = work[-1]
+                advanced = False
+                for succ in successors:
+                    if succ not in index:
+                        index[succ] = low[succ] = len(index)
+                        stack.append(succ)
+                        on_stack.add(succ)
+                        work.append((succ, iter(self.edges[succ])))
+                        advanced = True
+                        break
+                    if succ in on_stack:
+                        low[node] = min(low[node], index[succ])
+                if advanced:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+        return components
+
+    def find_cycle(self, component: list[int]) -> list[int]:
+        '''
+            Follow edges inside a strongly connected component until a transaction repeats
+            params:
+            component = strongly connected component with more than one transaction
+        '''
+        members = set(component)
+        seen: dict[int, int] = {}
+        path: list[int] = []
+        node = component[0]
+        while node not in seen:
+            seen[node] = len(path)
+            path.append(node)
+            node = next(succ for succ in self.edges[node] if succ in members)
+        return path[seen[node]:]
+
+    def check(self) -> SerializabilityResult:
+        '''
+            Decide conflict and view serializability of the operations added so far
+        '''
+        components = self.strongly_connected()
+        for component in components:
+            if len(component) > 1:
+                cycle = self.find_cycle(component)
+                # Without blind writes view serializability is the same as conflict serializability
+                view = None if self.blind_write else False
+                return SerializabilityResult(False, view, None, cycle)
+        order = [component[0] for component in reversed(components)]
+        return SerializabilityResult(True, True, order, None)
+
+
+# A commit standing alone between semicolons, never an item inside parentheses
+COMMIT_PATTERN = re.compile(r'(?:^|;)\s*[Cc](\d+)\s*(?=;|$)')
+
+def committed_transactions(lines: Iterable[str]) -> set[int]:
+    '''
+        Transactions that commit somewhere in the schedule, only the commits are looked at
+        so this pass is much cheaper than parsing
+        params:
+        lines = schedule lines
+    '''
+    committed = set()
+    for line in lines:
+        for t_num in COMMIT_PATTERN.findall(line.split(COMMENT, 1)[0]):
+            committed.add(int(t_num))
+    return committed
+
+def check(ops: Iterable[Union[ScheduleOp, str]], committed: Optional[set[int]] = None) -> SerializabilityResult:
+    '''
+        Check a schedule, example TwoPL.final_result
+        params:
+        ops = parsed operations, or operation text such as R1(A)
+        committed = transactions to keep, every transaction if not given
+    '''
+    parser = ScheduleParser(ItemTable())
+    graph = PrecedenceGraph(committed)
+    for op in ops:
+        graph.add(parser.parse_op(op) if isinstance(op, str) else op)
+    return graph.check()
+
+def check_file(filename: str, committed_only: bool = True) -> SerializabilityResult:
+    '''
+        Check a schedule file in two streamed passes, the first one finds the committed transactions
+        params:
+        filename = schedule path
+        committed_only = drop the transactions that never commit
+    '''
+    committed = None
+    if committed_only:
+        with open(filename, 'r') as file:
+            committed = committed_transactions(file)
+    return check(FileHandler(filename).operations(ScheduleParser()), committed)
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m dbcc.Serializability',
+                                     description='Check whether a schedule is conflict and view serializable')
+    parser.add_argument('filename', help='schedule file')
+    parser.add_argument('--all', action='store_true', help='keep the transactions that never commit')
+    args = parser.parse_args()
+
+    result = check_file(args.filename, not args.all)
+    print(json.dumps(result._asdict()))
+
+if __name__ == '__main__':
+    main()
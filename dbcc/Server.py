@@ -0,0 +1,478 @@
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+from collections import Counter, deque
+from typing import Optional
+
+from dbcc.Engine import PROTOCOL_2PL, PROTOCOL_OCC, PROTOCOLS, ConcurrencyControl, make_engine
+from dbcc.Events import EventSink
+from dbcc.occ.Occ import RETRY_LIMIT
+from dbcc.occ.Store import KeyValueStore
+from dbcc.Parser import COMMIT, READ, WRITE, ScheduleOp
+from dbcc.twopl.twoPL import POLICIES, VICTIM_OPS, VICTIMS, WOUND_WAIT
+from dbcc.Wal import GROUP_DELAY, GROUP_SIZE, WalSink, WriteAheadLog
+
+HOST = '127.0.0.1'
+PORT = 7878
+# Longest request line, a batch of many operations is a single line
+LINE_LIMIT = 1 << 20
+KINDS = {'read': READ, 'write': WRITE, 'commit': COMMIT}
+
+
+class RequestError(Exception):
+    '''
+    Class RequestError, a request the server answers with an error instead of running it
+    '''
+    pass
+
+
+class TouchedSink(EventSink):
+    '''
+    Class TouchedSink, remembers which transactions the events of one engine call were about
+    Only those can have stopped waiting, so the server never rescans every waiting transaction
+    '''
+    def __init__(self):
+        '''
+            Initiate needed variables
+            touched = transactions named by an event since the last clear
+            aborts = rollbacks of every transaction still open
+            gave_up = transactions OCC dropped after too many restarts
+            values = value of the last read of each transaction, only OCC reports values
+        '''
+        self.touched: set[int] = set()
+        self.aborts: Counter = Counter()
+        self.gave_up: set[int] = set()
+        self.values: dict[int, object] = {}
+
+    def emit(self, event: str, **fields):
+        t_num = fields.get('t_num')
+        if t_num is None:
+            return
+        self.touched.add(t_num)
+        if event == 'abort':
+            # 2PL names the rolled back transaction apart from the one that asked for the lock
+            victim = fields.get('victim', t_num)
+            self.touched.add(victim)
+            self.aborts[victim] += 1
+        elif event == 'giveup':
+            self.gave_up.add(t_num)
+        elif event == 'read' and 'value' in fields:
+            self.values[t_num] = fields['value']
+
+    def forget(self, t_num: int):
+        '''
+            Drop what was kept about a finished transaction
+            params:
+            t_num = transaction id
+        '''
+        self.aborts.pop(t_num, None)
+        self.gave_up.discard(t_num)
+        self.values.pop(t_num, None)
+
+
+class Session:
+    '''
+    Class Session, the transactions of one client connection
+    '''
+    def __init__(self):
+        '''
+            Initiate needed variables
+            open = transactions begun and not committed yet
+            tails = per transaction, resolved once its last accepted request is answered
+            tasks = requests still running
+        '''
+        self.open: set[int] = set()
+        self.tails: dict[int, asyncio.Future] = {}
+        self.tasks: set[asyncio.Task] = set()
+
+
+class TransactionServer:
+    '''
+    Class TransactionServer, serves begin, read, write and commit requests of many connections on one engine
+    Every request is a JSON object on its own line, a JSON array of them is a batch answered by one array.
+    Requests are read ahead without waiting for the answers, so a client may pipeline them and match the
+    answers, which may come out of order, by their id. Operations of one transaction still run in the order sent.
+    The engine is only touched from the event loop, an operation that has to wait is an awaited future
+    resolved by the engine call that unblocks it. With a write-ahead log a commit is answered once its
+    record is synced, the commits of one group delay share one fsync run off the event loop
+    '''
+    def __init__(self, engine: ConcurrencyControl, sink: TouchedSink, wal: Optional[WriteAheadLog] = None):
+        '''
+            Initiate needed variables
+            params:
+            engine = the 2PL, OCC or MVCC engine every session shares
+            sink = the TouchedSink the engine emits to, possibly behind a WalSink
+            wal = log the engine commits are appended to, built with flush_on_append False
+            waiting = per transaction, the future and operation of its blocked request
+            syncs = (log sequence number, future) of the commits waiting for their record to be synced
+            closed = transactions rolled back because their connection closed, their requests still in flight are refused
+        '''
+        self.engine = engine
+        self.sink = sink
+        self.wal = wal
+        self.waiting: dict[int, tuple[asyncio.Future, ScheduleOp]] = {}
+        self.syncs: deque[tuple[int, asyncio.Future]] = deque()
+        self.closed: set[int] = set()
+        # Created by sync_loop inside the event loop
+        self.wake: Optional[asyncio.Event] = None
+        self.full: Optional[asyncio.Event] = None
+        self.next_t_num = 1
+        self.counts: Counter = Counter()
+
+    def begin(self, session: Session) -> int:
+        '''
+            Start a transaction, engines only learn about it from its first operation
+            params:
+            session = session the transaction belongs to
+        '''
+        t_num = self.next_t_num
+        self.next_t_num += 1
+        session.open.add(t_num)
+        self.counts['begins'] += 1
+        return t_num
+
+    def outcome(self, op: ScheduleOp) -> dict:
+        '''
+            Answer of an operation the engine is done with
+            params:
+            op = operation
+        '''
+        t_num = op.t_num
+        if t_num in self.sink.gave_up:
+            answer = {'ok': False, 'error': f"T{t_num} gave up after too many restarts", 't': t_num}
+        elif t_num in self.closed:
+            answer = {'ok': False, 'error': f"T{t_num} was rolled back, its connection closed", 't': t_num}
+        else:
+            answer = {'ok': True, 't': t_num}
+        if op.kind == READ and t_num in self.sink.values:
+            answer['value'] = self.sink.values.pop(t_num)
+        aborts = self.sink.aborts.get(t_num)
+        if aborts:
+            answer['aborts'] = aborts
+        if op.kind == COMMIT:
+            self.sink.forget(t_num)
+        return answer
+
+    def submit(self, op: ScheduleOp) -> asyncio.Future:
+        '''
+            Give an operation to the engine, the future resolves once the engine ran it
+            params:
+            op = operation, at most one per transaction is submitted at a time
+        '''
+        future = asyncio.get_running_loop().create_future()
+        self.counts['ops'] += 1
+        if op.t_num in self.sink.gave_up or op.t_num in self.closed:
+            future.set_result(self.outcome(op))
+            return future
+        self.sink.touched.clear()
+        self.engine.submit(op)
+        self.waiting[op.t_num] = (future, op)
+        self.sink.touched.add(op.t_num)
+        self.settle()
+        return future
+
+    def settle(self):
+        '''
+            Answer the waiting operations of the transactions the last engine call touched that are no longer blocked
+        '''
+        for t_num in self.sink.touched:
+            entry = self.waiting.get(t_num)
+            if entry is not None and not self.engine.blocked(t_num):
+                del self.waiting[t_num]
+                entry[0].set_result(self.outcome(entry[1]))
+
+    def abort(self, t_num: int):
+        '''
+            Roll back a transaction left open by a closed connection. Its blocked request is answered with an error,
+            and the transactions its locks or versions held back go on
+            params:
+            t_num = transaction id
+        '''
+        self.closed.add(t_num)
+        self.sink.touched.clear()
+        self.engine.abort(t_num)
+        self.sink.touched.add(t_num)
+        self.settle()
+        self.sink.forget(t_num)
+
+    async def run(self, session: Session, t_num: int, op: ScheduleOp) -> dict:
+        '''
+            Run an operation once every earlier request of its transaction is answered
+            params:
+            session = session the transaction belongs to
+            t_num = transaction id
+            op = operation
+        '''
+        previous = session.tails.get(t_num)
+        done = asyncio.get_running_loop().create_future()
+        session.tails[t_num] = done
+        try:
+            if previous is not None:
+                await previous
+            return await self.submit(op)
+        finally:
+            done.set_result(None)
+            if session.tails.get(t_num) is done:
+                del session.tails[t_num]
+
+    async def durable(self):
+        '''
+            Wait until every record logged so far is synced
+        '''
+        wal = self.wal
+        lsn = wal.appended
+        if wal.durable >= lsn:
+            return
+        future = asyncio.get_running_loop().create_future()
+        self.syncs.append((lsn, future))
+        self.wake.set()
+        if wal.buffered() >= wal.group_size:
+            self.full.set()
+        await future
+
+    async def sync_loop(self):
+        '''
+            Sync the log in groups while commits wait for it: a group is synced once it is full or its
+            first commit waited the group delay, the fsync runs on a worker thread so requests go on meanwhile
+        '''
+        loop = asyncio.get_running_loop()
+        self.wake = asyncio.Event()
+        self.full = asyncio.Event()
+        while True:
+            await self.wake.wait()
+            self.wake.clear()
+            if self.wal.buffered() < self.wal.group_size:
+                try:
+                    await asyncio.wait_for(self.full.wait(), self.wal.group_delay)
+                except asyncio.TimeoutError:
+                    pass
+            self.full.clear()
+            await loop.run_in_executor(None, self.wal.flush)
+            while self.syncs and self.syncs[0][0] <= self.wal.durable:
+                self.syncs.popleft()[1].set_result(None)
+            if self.syncs:
+                self.wake.set()
+
+    async def handle(self, session: Session, request, batch_t_num: Optional[int] = None) -> dict:
+        '''
+            Answer one request
+            params:
+            session = session of the connection
+            request = decoded request, example {"id": 1, "op": "read", "t": 3, "item": "A"}
+            batch_t_num = transaction begun earlier in the same batch, used when the request names none
+        '''
+        try:
+            if not isinstance(request, dict):
+                raise RequestError("A request must be a JSON object")
+            name = request.get('op')
+            if name == 'begin':
+                answer = {'ok': True, 't': batch_t_num if batch_t_num is not None else self.begin(session)}
+            elif name == 'stats':
+                answer = {'ok': True, 'stats': self.stats()}
+            elif name in KINDS:
+                t_num = request.get('t', batch_t_num)
+                if not isinstance(t_num, int) or t_num not in session.open:
+                    raise RequestError(f"T{t_num} is not open on this connection")
+                item = None
+                if name != 'commit':
+                    item = request.get('item')
+                    if not isinstance(item, str) or not item:
+                        raise RequestError(f"{name} needs an item")
+                    item = self.engine.items.intern(item)
+                else:
+                    # Later requests of the transaction are refused, the ones already sent still run first
+                    session.open.discard(t_num)
+                op = ScheduleOp(KINDS[name], t_num, item, 0, request.get('value') if name == 'write' else None)
+                answer = await self.run(session, t_num, op)
+                if name == 'commit' and self.wal is not None and answer['ok']:
+                    await self.durable()
+            else:
+                raise RequestError(f"Unknown op : {name}")
+        except RequestError as e:
+            answer = {'ok': False, 'error': str(e)}
+        except Exception as e:
+            self.counts['errors'] += 1
+            answer = {'ok': False, 'error': f"{type(e).__name__} : {e}"}
+        if isinstance(request, dict) and 'id' in request:
+            answer['id'] = request['id']
+        return answer
+
+    async def respond(self, session: Session, line: bytes, answers: asyncio.Queue):
+        '''
+            Answer one request line, a single request or a batch
+            params:
+            session = session of the connection
+            line = request line
+            answers = queue of the connection writer
+        '''
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            answers.put_nowait({'ok': False, 'error': f"Invalid JSON : {e}"})
+            return
+        if not isinstance(request, list):
+            answers.put_nowait(await self.handle(session, request))
+            return
+        # The handlers are started in order, so operations of a transaction keep the batch order
+        handlers = []
+        t_num = None
+        for entry in request:
+            if isinstance(entry, dict) and entry.get('op') == 'begin':
+                t_num = self.begin(session)
+            handlers.append(self.handle(session, entry, t_num))
+        answers.put_nowait(list(await asyncio.gather(*handlers)))
+
+    async def write_answers(self, answers: asyncio.Queue, writer: asyncio.StreamWriter):
+        '''
+            Write the answers of a connection as they come, flushing once the queue runs dry
+            params:
+            answers = queue of answers, None ends the connection
+            writer = connection stream
+        '''
+        while True:
+            answer = await answers.get()
+            if answer is None:
+                break
+            if writer.is_closing():
+                continue
+            writer.write(json.dumps(answer).encode() + b"\n")
+            if answers.empty():
+                try:
+                    await writer.drain()
+                except ConnectionError:
+                    # The client left, keep draining the queue so the session can close
+                    pass
+
+    async def connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        '''
+            Serve one client connection until it closes
+            params:
+            reader, writer = connection streams
+        '''
+        session = Session()
+        answers: asyncio.Queue = asyncio.Queue()
+        writing = asyncio.ensure_future(self.write_answers(answers, writer))
+        self.counts['connections'] += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError):
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.ensure_future(self.respond(session, line, answers))
+                session.tasks.add(task)
+                task.add_done_callback(session.tasks.discard)
+        finally:
+            # A transaction left open is rolled back, so its locks are released and its writes never commit
+            closing = list(session.open)
+            session.open.clear()
+            for t_num in closing:
+                self.abort(t_num)
+            self.counts['closed_open'] += len(closing)
+            await asyncio.gather(*session.tasks)
+            self.closed.difference_update(closing)
+            answers.put_nowait(None)
+            await writing
+            writer.close()
+            self.counts['connections'] -= 1
+
+    def stats(self) -> dict:
+        '''
+            Engine stats with the server counters
+        '''
+        stats = self.engine.stats()
+        stats.update(begins=self.counts['begins'], requests=self.counts['ops'],
+                     connections=self.counts['connections'], blocked=len(self.waiting), errors=self.counts['errors'],
+                     closed_open=self.counts['closed_open'])
+        if self.wal is not None:
+            stats['wal'] = self.wal.stats()
+        return stats
+
+
+async def serve(server: TransactionServer, host: str = HOST, port: int = PORT, unix: Optional[str] = None):
+    '''
+        Accept connections until cancelled
+        params:
+        server = transaction server
+        host, port = TCP address to listen on
+        unix = Unix socket path, used instead of TCP when given
+    '''
+    if unix:
+        listener = await asyncio.start_unix_server(server.connection, unix, limit=LINE_LIMIT)
+        address = unix
+    else:
+        listener = await asyncio.start_server(server.connection, host, port, limit=LINE_LIMIT, backlog=4096)
+        address = f"{host}:{port}"
+    print(f"Serving {server.engine.name} on {address}", file=sys.stderr, flush=True)
+    serving = asyncio.ensure_future(listener.serve_forever())
+    syncing = asyncio.ensure_future(server.sync_loop()) if server.wal is not None else None
+    if hasattr(signal, 'SIGTERM'):
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, serving.cancel)
+        except NotImplementedError:
+            pass
+    try:
+        await serving
+    except asyncio.CancelledError:
+        pass
+    finally:
+        listener.close()
+        if syncing is not None:
+            syncing.cancel()
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog='python -m dbcc.Server',
+                                     description='Serve begin, read, write and commit requests over a local socket')
+    parser.add_argument('-p', '--protocol', required=True, choices=PROTOCOLS)
+    parser.add_argument('--host', default=HOST, help=f'TCP address (default {HOST})')
+    parser.add_argument('--port', type=int, default=PORT, help=f'TCP port (default {PORT})')
+    parser.add_argument('--unix', default=None, metavar='PATH', help='listen on a Unix socket instead of TCP')
+    parser.add_argument('--policy', default=WOUND_WAIT, choices=POLICIES, help='2PL deadlock handling')
+    parser.add_argument('--victim', default=VICTIM_OPS, choices=VICTIMS, help='2PL deadlock victim with --policy detect')
+    parser.add_argument('--max-retries', type=int, default=RETRY_LIMIT, metavar='N',
+                        help=f'OCC drops a transaction after N restarts, 0 always restarts (default {RETRY_LIMIT})')
+    parser.add_argument('--wal', default=None, metavar='PATH',
+                        help='answer commits once synced to this write-ahead log, replayed first to rebuild the OCC store')
+    parser.add_argument('--group-size', type=int, default=GROUP_SIZE, metavar='N',
+                        help=f'sync the log as soon as N commits wait, without the group delay (default {GROUP_SIZE})')
+    parser.add_argument('--group-delay', type=float, default=GROUP_DELAY * 1000, metavar='MS',
+                        help=f'milliseconds the first commit of a group waits for others (default {GROUP_DELAY * 1000:g})')
+    args = parser.parse_args(argv)
+
+    sink = TouchedSink()
+    wal = None
+    if args.protocol == PROTOCOL_2PL:
+        options = {'policy': args.policy, 'victim': args.victim, 'record_history': False}
+    elif args.protocol == PROTOCOL_OCC:
+        # The logical clock only moves on requests, a backoff could keep a restart waiting for ever
+        options = {'retry_limit': args.max_retries, 'backoff': 0}
+    else:
+        options = {}
+    engine_sink = sink
+    if args.wal:
+        wal = WriteAheadLog(args.wal, args.group_size, args.group_delay / 1000, flush_on_append=False)
+        engine_sink = WalSink(wal, sink)
+        if args.protocol == PROTOCOL_OCC:
+            options['store'] = KeyValueStore(wal.recovered.state)
+        print(f"Recovered {wal.recovered.commits} commits, {len(wal.recovered.state)} items from {args.wal}",
+              file=sys.stderr, flush=True)
+    server = TransactionServer(make_engine(args.protocol, engine_sink, **options), sink, wal)
+    if args.unix and os.path.exists(args.unix):
+        os.unlink(args.unix)
+    try:
+        asyncio.run(serve(server, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    if wal is not None:
+        wal.close()
+    print(json.dumps(server.stats()), file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,301 @@
+import argparse
+import json
+import os
+import threading
+import time
+from typing import NamedTuple, Optional
+
+from dbcc.Engine import Histogram
+from dbcc.Events import EventSink
+
+# Buffered records that make a group due at once
+GROUP_SIZE = 64
+# Seconds the first record of a group waits for others to join before it is synced
+GROUP_DELAY = 0.002
+
+
+class Recovery(NamedTuple):
+    '''
+    Class Recovery, what replaying a log gives back
+    state = item name to its value after every committed transaction in the log
+    epoch = number of the last run that wrote to the log, 0 for a new log
+    size = bytes of the log up to the last complete record, a torn tail after it is dropped
+    commits = committed transactions replayed
+    '''
+    state: dict
+    epoch: int
+    size: int
+    commits: int
+
+
+def recover(path: str) -> Recovery:
+    '''
+        Rebuild the committed state from a log. Every run of an engine appends an epoch record first, then one
+        record per committed transaction with its writes and an undo record when a commit is rolled back (MVCC).
+        Writes are applied in the equivalent serial order: by epoch, then by the timestamp of the commit
+        when it has one (MVCC, basic and strict 2PL), else by log order
+        params:
+        path = log file, a missing file is an empty log
+    '''
+    epoch = 0
+    size = 0
+    # (epoch, t_num) to (serial order key, writes) of every commit still standing
+    commits: dict[tuple[int, int], tuple[tuple[int, int], dict]] = {}
+    if os.path.exists(path):
+        with open(path, 'rb') as file:
+            for (index, line) in enumerate(file):
+                # A record cut short by a crash was never synced, so nothing was acknowledged from it
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                size += len(line)
+                if 'epoch' in record:
+                    epoch = record['epoch']
+                elif 'undo' in record:
+                    commits.pop((epoch, record['undo']), None)
+                else:
+                    commits[(epoch, record['t'])] = ((epoch, record.get('ts', index)), record['w'])
+    state: dict = {}
+    for (_, writes) in sorted(commits.values(), key=lambda commit: commit[0]):
+        state.update(writes)
+    return Recovery(state, epoch, size, len(commits))
+
+
+class WriteAheadLog:
+    '''
+    Class WriteAheadLog, append only log of committed transactions with group commit.
+    Records are buffered and written with one fsync per group, once the group is full or its first record
+    waited the group delay. A record is durable once durable reaches its sequence number. Appends, flush and
+    wait are thread safe, and appends go on into the next group while a group is being synced
+    '''
+    def __init__(self, path: str, group_size: int = GROUP_SIZE, group_delay: float = GROUP_DELAY,
+                 sync: bool = True, flush_on_append: bool = True):
+        '''
+            Initiate needed variables, replaying the log first
+            params:
+            path = log file, created if missing
+            group_size = buffered records that make the group due without waiting, 1 syncs every record at once
+            group_delay = seconds the first record of a group waits for others
+            sync = fsync every group, False only writes it to the OS
+            flush_on_append = sync from append once the group is due, else only flush and wait sync
+            recovered = state replayed from the log, see recover
+            appended, durable = sequence number of the last record appended and of the last one synced
+        '''
+        if group_size < 1 or group_delay < 0:
+            raise ValueError("group_size must be at least 1 and group_delay must not be negative")
+        self.path = path
+        self.group_size = group_size
+        self.group_delay = group_delay
+        self.sync = sync
+        self.flush_on_append = flush_on_append
+        self.recovered = recover(path)
+        # Drop a torn tail so the next record starts on its own line
+        if os.path.exists(path) and os.path.getsize(path) > self.recovered.size:
+            os.truncate(path, self.recovered.size)
+        self.file = open(path, 'ab')
+        # Bytes of the log known to be written, a failed group is cut back to it
+        self.size = self.recovered.size
+        self.condition = threading.Condition()
+        self.buffer: list[bytes] = []
+        # Monotonic time the oldest buffered record was appended
+        self.first: Optional[float] = None
+        self.flushing = False
+        self.appended = 0
+        self.durable = 0
+        self.groups = Histogram()
+        self.sync_us = Histogram()
+        self.append({'epoch': self.recovered.epoch + 1})
+        self.flush()
+
+    def append(self, record: dict) -> int:
+        '''
+            Buffer a record, return its sequence number
+            params:
+            record = JSON serializable record
+        '''
+        line = json.dumps(record, separators=(',', ':')).encode() + b"\n"
+        with self.condition:
+            self.buffer.append(line)
+            self.appended += 1
+            lsn = self.appended
+            if self.first is None:
+                self.first = time.monotonic()
+            if self.flush_on_append and not self.flushing and self.due():
+                self._flush()
+            return lsn
+
+    def due(self) -> bool:
+        '''
+            Whether the buffered group should be synced now, called with the condition held
+        '''
+        if not self.buffer:
+            return False
+        return len(self.buffer) >= self.group_size or time.monotonic() - self.first >= self.group_delay
+
+    def _flush(self):
+        '''
+            Write and sync the buffered group, called with the condition held and no flush running.
+            The condition is released during the write, so appends can fill the next group meanwhile.
+            When the write or the sync fails, the group goes back in front of the buffer and the error is raised
+        '''
+        group = self.buffer
+        first = self.first
+        lsn = self.appended
+        data = b"".join(group)
+        self.buffer = []
+        self.first = None
+        self.flushing = True
+        self.condition.release()
+        try:
+            start = time.perf_counter()
+            self.file.write(data)
+            self.file.flush()
+            if self.sync:
+                (os.fdatasync if hasattr(os, 'fdatasync') else os.fsync)(self.file.fileno())
+            elapsed = time.perf_counter() - start
+        except BaseException:
+            # Cut what reached the file, so the group is written once when retried
+            # and recovery does not stop at a torn record in the middle of the log
+            try:
+                self._rewind()
+            finally:
+                self.condition.acquire()
+                self.flushing = False
+                self.buffer = group + self.buffer
+                self.first = first
+                self.condition.notify_all()
+            raise
+        self.condition.acquire()
+        self.flushing = False
+        self.size += len(data)
+        self.durable = lsn
+        self.groups.add(len(group))
+        self.sync_us.add(round(elapsed * 1e6))
+        self.condition.notify_all()
+
+    def _rewind(self):
+        '''
+            Reopen the log at the last group written, dropping the bytes of a failed group and what is left of it
+            in the file buffer
+        '''
+        try:
+            self.file.close()
+        except OSError:
+            pass
+        os.truncate(self.path, self.size)
+        self.file = open(self.path, 'ab')
+
+    def flush(self):
+        '''
+            Sync every record appended so far, waiting for a running flush first
+        '''
+        with self.condition:
+            target = self.appended
+            while self.durable < target:
+                if self.flushing:
+                    self.condition.wait()
+                else:
+                    self._flush()
+
+    def wait(self, lsn: int):
+        '''
+            Block until a record is durable. The first waiter of a group syncs it once it is due,
+            the others sleep until then, so concurrent commits share one fsync
+            params:
+            lsn = sequence number returned by append
+        '''
+        with self.condition:
+            while self.durable < lsn:
+                if self.flushing:
+                    self.condition.wait()
+                elif self.due():
+                    self._flush()
+                else:
+                    self.condition.wait(max(0.0, self.first + self.group_delay - time.monotonic()))
+
+    def buffered(self) -> int:
+        '''
+            Records appended and not written yet
+        '''
+        return len(self.buffer)
+
+    def close(self):
+        '''
+            Sync what is left and close the file
+        '''
+        self.flush()
+        self.file.close()
+
+    def stats(self) -> dict:
+        '''
+            Records and fsyncs so far, with the group size and fsync time in microseconds histograms
+        '''
+        return {
+            'records': self.durable,
+            'fsyncs': self.groups.count,
+            'group': self.groups.summary(),
+            'sync_us': self.sync_us.summary(),
+            'recovered_commits': self.recovered.commits,
+        }
+
+
+class WalSink(EventSink):
+    '''
+    Class WalSink, logs every committed transaction with its writes and passes every event on to another sink.
+    Writes are collected from the write events of a transaction and dropped when it is rolled back,
+    a rollback after the commit (MVCC) is logged as an undo record.
+    A write without a value logs the id of the writing transaction, like OCC does
+    '''
+    def __init__(self, wal: WriteAheadLog, sink: Optional[EventSink] = None):
+        '''
+            Initiate needed variables
+            params:
+            wal = log the commits are appended to
+            sink = sink the events are passed on to, dropped if not given
+            writes = writes of every running transaction, item name to value
+        '''
+        self.wal = wal
+        self.sink = sink if sink is not None else EventSink()
+        self.verbose = self.sink.verbose
+        self.writes: dict[int, dict] = {}
+
+    def emit(self, event: str, **fields):
+        self.sink.emit(event, **fields)
+        t_num = fields.get('t_num')
+        if event == 'write':
+            # 2PL reports queued writes too, they only count once they run
+            if fields.get('success', True) and not fields.get('queued', False):
+                value = fields.get('value')
+                self.writes.setdefault(t_num, {})[fields['item']] = value if value is not None else t_num
+        elif event == 'abort':
+            victim = fields.get('victim', t_num)
+            self.writes.pop(victim, None)
+            if fields.get('committed', False):
+                self.wal.append({'undo': victim})
+        elif event == 'commit' and fields.get('success', True):
+            writes = self.writes.pop(t_num, None)
+            # A read only transaction changes nothing to recover
+            if writes:
+                record = {'t': t_num, 'w': writes}
+                if fields.get('timestamp') is not None:
+                    record['ts'] = fields['timestamp']
+                self.wal.append(record)
+
+    def close(self):
+        self.sink.close()
+        self.wal.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m dbcc.Wal', description='Replay a write-ahead log and print the recovered state')
+    parser.add_argument('path', help='log file')
+    args = parser.parse_args()
+
+    recovery = recover(args.path)
+    print(json.dumps({'epoch': recovery.epoch, 'commits': recovery.commits, 'state': recovery.state}))
+
+if __name__ == '__main__':
+    main()
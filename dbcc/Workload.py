@@ -0,0 +1,127 @@
+import argparse
+import random
+import sys
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Iterator, Optional, TextIO
+
+from dbcc.Parser import COMMIT, READ, WRITE, ItemTable, ScheduleOp, format_op
+
+
+class Workload:
+    '''
+    Class Workload, generates synthetic schedules of many interleaved transactions
+    Operations are produced one at a time, so a schedule of any length is streamed in constant memory
+    '''
+    def __init__(self, transactions: int = 100, ops_per_transaction: int = 4, read_ratio: float = 0.5,
+                 items: int = 10, skew: float = 0.0, concurrency: int = 4, seed: Optional[int] = None):
+        '''
+            Initiate needed variables
+            params:
+            transactions = number of transactions, numbered from 1
+            ops_per_transaction = reads and writes of every transaction, its commit comes after them
+            read_ratio = probability that an operation is a read
+            items = number of distinct items, named Item0, Item1, ...
+            skew = Zipfian exponent of the item popularity, Item0 is the hottest, 0 is uniform
+            concurrency = transactions open at once, the next operation comes from one of them at random, 1 is serial
+            seed = random seed, the same seed gives the same schedule
+        '''
+        if transactions < 0 or ops_per_transaction < 0:
+            raise ValueError("transactions and ops_per_transaction must not be negative")
+        if not 0.0 <= read_ratio <= 1.0:
+            raise ValueError("read_ratio must be between 0 and 1")
+        if items < 1 or concurrency < 1:
+            raise ValueError("items and concurrency must be at least 1")
+        if skew < 0:
+            raise ValueError("skew must not be negative")
+        self.transactions = transactions
+        self.ops_per_transaction = ops_per_transaction
+        self.read_ratio = read_ratio
+        self.items = items
+        self.skew = skew
+        self.concurrency = concurrency
+        self.seed = seed
+        # Cumulative Zipfian weights, an item is drawn by bisecting a uniform draw into them
+        self.cum_weights = list(accumulate(1.0 / (rank + 1) ** skew for rank in range(items))) if skew else None
+
+    def item_rank(self, rng: random.Random) -> int:
+        '''
+            Draw the rank of the item an operation touches
+            params:
+            rng = random generator of the current schedule
+        '''
+        if self.cum_weights is None:
+            return rng.randrange(self.items)
+        return min(bisect_left(self.cum_weights, rng.random() * self.cum_weights[-1]), self.items - 1)
+
+    def operations(self, items: Optional[ItemTable] = None) -> Iterator[ScheduleOp]:
+        '''
+            Generate the schedule as the shared operation stream, the same one ScheduleParser produces
+            params:
+            items = item table to intern into, a new one is created if not given
+        '''
+        items = items if items is not None else ItemTable()
+        ids = [items.intern(f"Item{rank}") for rank in range(self.items)]
+        rng = random.Random(self.seed)
+
+        # Open transactions and the reads and writes each one still has to do
+        open_t_nums: list[int] = []
+        remaining: dict[int, int] = {}
+        next_t_num = 1
+        line = 0
+        while open_t_nums or next_t_num <= self.transactions:
+            # Keep the interleaving window full
+            while len(open_t_nums) < self.concurrency and next_t_num <= self.transactions:
+                open_t_nums.append(next_t_num)
+                remaining[next_t_num] = self.ops_per_transaction
+                next_t_num += 1
+
+            index = rng.randrange(len(open_t_nums))
+            t_num = open_t_nums[index]
+            line += 1
+            if remaining[t_num]:
+                remaining[t_num] -= 1
+                kind = READ if rng.random() < self.read_ratio else WRITE
+                yield ScheduleOp(kind, t_num, ids[self.item_rank(rng)], line)
+            else:
+                # The transaction is done, swap it out of the window
+                del remaining[t_num]
+                open_t_nums[index] = open_t_nums[-1]
+                open_t_nums.pop()
+                yield ScheduleOp(COMMIT, t_num, None, line)
+
+    def write(self, stream: TextIO):
+        '''
+            Write the schedule in the R1(A); notation, one operation per line
+            params:
+            stream = where the schedule is written
+        '''
+        items = ItemTable()
+        separator = ""
+        for op in self.operations(items):
+            stream.write(separator + format_op(op, items))
+            separator = ";\n"
+        stream.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic schedule')
+    parser.add_argument('-t', '--transactions', type=int, default=100, help='number of transactions')
+    parser.add_argument('-n', '--ops', type=int, default=4, help='reads and writes per transaction, before its commit')
+    parser.add_argument('-r', '--read-ratio', type=float, default=0.5, help='probability that an operation is a read')
+    parser.add_argument('-i', '--items', type=int, default=10, help='number of distinct items')
+    parser.add_argument('-s', '--skew', type=float, default=0.0, help='Zipfian skew of the item popularity, 0 is uniform')
+    parser.add_argument('-c', '--concurrency', type=int, default=4, help='transactions interleaved at once, 1 is serial')
+    parser.add_argument('--seed', type=int, default=None, help='random seed for a reproducible schedule')
+    parser.add_argument('-o', '--output', default='-', help='schedule file, - for stdout')
+    args = parser.parse_args()
+
+    workload = Workload(args.transactions, args.ops, args.read_ratio, args.items, args.skew, args.concurrency, args.seed)
+    if args.output == '-':
+        workload.write(sys.stdout)
+    else:
+        with open(args.output, 'w') as stream:
+            workload.write(stream)
+
+if __name__ == '__main__':
+    main()
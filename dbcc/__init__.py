@@ -0,0 +1,5 @@
+'''
+Shared building blocks for the 2PL, OCC and MVCC simulators
+'''
+from dbcc.Engine import (PROTOCOL_2PL, PROTOCOL_MVCC, PROTOCOL_OCC, PROTOCOLS, ConcurrencyControl, Histogram,
+                         make_engine)
@@ -0,0 +1,125 @@
+import argparse
+import json
+import sys
+
+from dbcc.Engine import PROTOCOL_2PL, PROTOCOL_MVCC, PROTOCOL_OCC, PROTOCOLS, make_engine
+from dbcc.Events import CONSOLE, QUIET, SINKS, make_sink
+from dbcc.FileHandler import FileHandler
+from dbcc.mvcc.Mvcc import VACUUM_THRESHOLD, format_event as mvcc_format_event
+from dbcc.occ.Occ import BACKOFF, RETRY_LIMIT, format_event as occ_format_event
+from dbcc.occ.Store import KeyValueStore
+from dbcc.Parser import ScheduleParser
+from dbcc.twopl.LiveTwoPL import LiveTwoPL, transaction_programs
+from dbcc.twopl.twoPL import (POLICIES, RIGOROUS, VARIANTS, VICTIM_OPS, VICTIMS, WOUND_WAIT, count_operations,
+                              format_event as twopl_format_event)
+from dbcc.Wal import GROUP_DELAY, GROUP_SIZE, WalSink, WriteAheadLog
+
+FORMATTERS = {PROTOCOL_2PL: twopl_format_event, PROTOCOL_OCC: occ_format_event, PROTOCOL_MVCC: mvcc_format_event}
+TITLES = {
+    PROTOCOL_2PL: ("Two Phase Locking", "Two Phase Locking Protocol"),
+    PROTOCOL_OCC: ("OCC", "OCC Protocol"),
+    PROTOCOL_MVCC: ("MVCC", "MVCC Timestamp Ordering Protocol"),
+}
+
+def options(args) -> dict:
+    '''
+        Engine settings of the chosen protocol
+        params:
+        args = parsed command line
+    '''
+    if args.protocol == PROTOCOL_2PL:
+        options = {'policy': args.policy, 'victim': args.victim, 'variant': args.variant, 'record_history': args.log != QUIET}
+        if args.variant != RIGOROUS:
+            # The lock point of a transaction is only known once all of its operations are seen
+            if args.filename == '-':
+                raise Exception(f"The {args.variant} variant reads the schedule twice, give a file instead of -")
+            options['lock_points'] = count_operations(FileHandler(args.filename).operations(ScheduleParser()))
+        return options
+    if args.protocol == PROTOCOL_OCC:
+        return {'retry_limit': args.max_retries, 'backoff': args.backoff}
+    return {'vacuum_threshold': args.vacuum}
+
+def live(args):
+    '''
+        Run the transactions of the schedule concurrently with LiveTwoPL
+        params:
+        args = parsed command line
+    '''
+    sink = make_sink(args.log, FORMATTERS[PROTOCOL_2PL])
+    engine = LiveTwoPL(args.policy, args.victim, sink=sink)
+    programs = transaction_programs(FileHandler(args.filename).operations(engine.parser))
+    if args.log == CONSOLE:
+        print(f"--- Running Two Phase Locking on {args.threads} threads ---\n")
+    stats = engine.run(programs, args.threads, args.think / 1000)
+    sink.close()
+    if args.log == CONSOLE:
+        print('\033[0m', end='')
+    if args.stats:
+        print(json.dumps(stats))
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog='dbcc', description='Simulate a concurrency control protocol on DB')
+    parser.add_argument('filename', help='schedule file, or - to read from stdin')
+    parser.add_argument('-p', '--protocol', required=True, choices=PROTOCOLS)
+    parser.add_argument('--log', default=CONSOLE, choices=SINKS, help='event output, quiet drops every event')
+    parser.add_argument('--stats', action='store_true', help='print the engine stats as JSON once the schedule is done')
+    parser.add_argument('--policy', default=WOUND_WAIT, choices=POLICIES,
+                        help='2PL deadlock prevention, or detect to find deadlocks in the waits-for graph')
+    parser.add_argument('--victim', default=VICTIM_OPS, choices=VICTIMS,
+                        help=f'cost used to choose the deadlock victim with --policy detect (default {VICTIM_OPS})')
+    parser.add_argument('--variant', default=RIGOROUS, choices=VARIANTS,
+                        help='2PL lock release, basic unlocks everything at the lock point, strict only the shared locks, '
+                             f'rigorous nothing before the commit (default {RIGOROUS})')
+    parser.add_argument('--threads', type=int, default=0, metavar='N',
+                        help='run every 2PL transaction on a pool of N threads with real blocking lock waits, '
+                             'the interleaving of the schedule is then ignored (default 0, replay the schedule)')
+    parser.add_argument('--think', type=float, default=0.0, metavar='MS',
+                        help='milliseconds a --threads transaction works after each operation while holding its locks')
+    parser.add_argument('--max-retries', type=int, default=RETRY_LIMIT, metavar='N',
+                        help=f'OCC drops a transaction after N restarts, 0 always restarts (default {RETRY_LIMIT})')
+    parser.add_argument('--backoff', type=int, default=BACKOFF, metavar='T',
+                        help=f'timestamps an aborted OCC transaction waits before restarting, doubled on every retry (default {BACKOFF})')
+    parser.add_argument('--vacuum', type=int, default=VACUUM_THRESHOLD, metavar='N',
+                        help=f'MVCC vacuums old versions every N new versions, 0 never vacuums (default {VACUUM_THRESHOLD})')
+    parser.add_argument('--wal', default=None, metavar='PATH',
+                        help='log every committed transaction to this write-ahead log, replayed first to rebuild the OCC store')
+    parser.add_argument('--group-size', type=int, default=GROUP_SIZE, metavar='N',
+                        help=f'sync the log as soon as N commits wait, without the group delay (default {GROUP_SIZE})')
+    parser.add_argument('--group-delay', type=float, default=GROUP_DELAY * 1000, metavar='MS',
+                        help=f'milliseconds the first commit of a group waits for others (default {GROUP_DELAY * 1000:g})')
+    args = parser.parse_args(argv)
+
+    if args.threads:
+        if args.protocol != PROTOCOL_2PL:
+            raise Exception("--threads is only supported by 2pl")
+        if args.wal:
+            raise Exception("--wal is not supported with --threads")
+        if args.variant != RIGOROUS:
+            raise Exception(f"The {args.variant} variant is not supported with --threads, locks are held until the commit")
+        return live(args)
+    settings = options(args)
+    sink = make_sink(args.log, FORMATTERS[args.protocol])
+    wal = None
+    if args.wal:
+        wal = WriteAheadLog(args.wal, args.group_size, args.group_delay / 1000)
+        sink = WalSink(wal, sink)
+        if args.protocol == PROTOCOL_OCC:
+            settings['store'] = KeyValueStore(wal.recovered.state)
+    if args.log == CONSOLE:
+        (name, protocol_name) = TITLES[args.protocol]
+        print(f"--- Simulating {name} on DB ---")
+        print(f"\nResult from {protocol_name}: ")
+    engine = make_engine(args.protocol, sink, **settings)
+    stats = engine.run(FileHandler(args.filename).operations(engine.parser))
+    sink.close()
+    if args.stats:
+        if wal is not None:
+            stats['wal'] = wal.stats()
+        print(json.dumps(stats))
+
+if __name__ == '__main__':
+    try:
+        main()
+    except Exception as e:
+        print(e)
+        sys.exit(1)
@@ -0,0 +1,200 @@
+import sys
+from bisect import bisect_left, bisect_right
+from dbcc.Parser import ItemTable, ScheduleOp
+
+class TransactionItem:
+    '''
+    Class TransactionItem, transaction item class
+    Slotted since every version of every item is one of these
+    '''
+    __slots__ = ('label', 'version', 'read_ts', 'write_ts', 'writer')
+
+    def __init__(self, label, version = 0, read_ts = 0, write_ts = 0, writer = None):
+        '''
+            Initiate needed variables
+            params:
+            label = item label
+            version = item version
+            read_ts = item read timestamp
+            write_ts = item write timestamp
+            writer = id of the transaction that created this version, None for the initial version.
+            Who read it is kept in the MVCC dependency graph (to handle cascading rollback)
+        '''
+        self.label: str = label
+        self.version: int = version
+        self.read_ts: int = read_ts
+        self.write_ts: int = write_ts
+        self.writer: int = writer
+
+    def __str__(self):
+        '''
+            Overriding to print as a string
+        '''
+        return f'{self.label}{self.version}({self.read_ts},{self.write_ts})'
+
+    def footprint(self):
+        '''
+            Approximate bytes held by this version
+        '''
+        return sys.getsizeof(self)
+
+
+class Operation:
+    '''
+    Class Operation, all possible ops on a transaction
+    Slotted since the simulator keeps one per operation of every active transaction
+    '''
+    __slots__ = ('operation', 't_num', 'item', 'value')
+
+    def __init__(self, op: ScheduleOp, items: ItemTable):
+        '''
+            Initiate needed variables
+            params:
+            op = parsed operation, example R1(A)
+            items = item table the operation item was interned in
+        '''
+        self.operation = op.kind
+        self.t_num = op.t_num
+        # Only the item name is needed, versions are created by the version controller
+        self.item = items.name(op.item) if op.item is not None else None
+        self.value = op.value
+            
+    def __str__(self):
+        '''
+            Overriding to print as a string
+        '''
+        if (self.operation == "W"):
+            return f'T{self.t_num} on {self.item} to DB  '
+        else:
+            return f'T{self.t_num} on {self.item} from DB'
+
+
+class MVCCTransaction():
+    '''
+    Class MVCCTransaction, state as a transaction object
+    '''
+    __slots__ = ('t_num', 'timestamp', 'arr_process', 'created_items')
+
+    def __init__(self, t_num, timestamp):
+        '''
+            Initiate needed variables
+            params:
+            t_num = transaction number
+            timestamp = transaction timestamp (TS)
+            arr_process = set of operation exist on that transaction
+            created_items = all items (different versions) created in this transaction
+        '''
+        self.t_num: int = t_num
+        self.timestamp: int = timestamp
+        self.arr_process: list[Operation] = []
+        self.created_items: list[TransactionItem] = []
+        
+    def __str__(self):
+        return f"{self.t_num}: [{';'.join(map(lambda x: str(x), self.arr_process))}]"
+        
+
+class VersionControl:
+    '''
+    Class VersionControl, handle multiple data versions
+    Every version chain is kept sorted by write timestamp, with a parallel list of the
+    write timestamps so the visible version is found with bisect instead of a scan
+    '''
+    def __init__(self):
+        '''
+            Initiate needed variables
+            map = item label to its versions, oldest write timestamp first
+            write_ts = item label to the write timestamps of map[label], same order
+            dirty = labels holding more than one version, the only chains vacuum has to look at
+            added = versions added since the last vacuum
+            versions_reclaimed, bytes_saved = totals of every vacuum so far
+        '''
+        self.map: dict[str, list[TransactionItem]] = {}
+        self.write_ts: dict[str, list[int]] = {}
+        self.dirty: dict[str, None] = {}
+        self.added = 0
+        self.versions_reclaimed = 0
+        self.bytes_saved = 0
+
+    def add_new_version(self, item: TransactionItem):
+        '''
+            Add new version to the version controller, at its write timestamp position
+            params:
+            item = transaction item with different version
+        '''
+        # If label not exist before, add new label and its item
+        if item.label not in self.map:
+            self.map[item.label] = [item]
+            self.write_ts[item.label] = [item.write_ts]
+        # Else, insert the item after every version with a lower or equal write timestamp
+        else:
+            keys = self.write_ts[item.label]
+            index = bisect_right(keys, item.write_ts)
+            keys.insert(index, item.write_ts)
+            self.map[item.label].insert(index, item)
+            self.dirty[item.label] = None
+            self.added += 1
+
+    def remove(self, item: TransactionItem):
+        '''
+            Remove one version from the version controller
+            params:
+            item = transaction item version to remove
+        '''
+        keys = self.write_ts[item.label]
+        versions = self.map[item.label]
+        index = bisect_left(keys, item.write_ts)
+        # Versions can share a write timestamp, look for this exact object among them
+        while versions[index] is not item:
+            index += 1
+        del keys[index]
+        del versions[index]
+
+    def visible(self, label: str, timestamp: int):
+        '''
+            Get the version a transaction with the given timestamp sees,
+            the one with the largest write timestamp less than or equal to it
+            params:
+            label = item name
+            timestamp = transaction timestamp (TS)
+        '''
+        index = bisect_right(self.write_ts[label], timestamp)
+        if index == 0:
+            return None
+        return self.map[label][index - 1]
+
+    def vacuum(self, horizon: int):
+        '''
+            Drop the versions no transaction with a timestamp at or above the horizon can see,
+            everything older than the newest version with W-TS < horizon. That version is always kept,
+            its writer already committed while a version written at the horizon may still be rolled back
+            Return the number of versions reclaimed and their approximate size in bytes
+            params:
+            horizon = lowest timestamp any live or future transaction can have
+        '''
+        reclaimed = 0
+        saved = 0
+        for label in list(self.dirty):
+            keys = self.write_ts[label]
+            versions = self.map[label]
+            index = bisect_left(keys, horizon) - 1
+            if index > 0:
+                for version in versions[:index]:
+                    saved += version.footprint()
+                reclaimed += index
+                del keys[:index]
+                del versions[:index]
+            if len(versions) == 1:
+                del self.dirty[label]
+
+        self.added = 0
+        self.versions_reclaimed += reclaimed
+        self.bytes_saved += saved
+        return reclaimed, saved
+
+    def get(self, label: str):
+        '''
+            Get all the version on spesific label name, ordered by write timestamp
+            params:
+            label = item name
+        '''
+        return self.map[label]
@@ -0,0 +1,401 @@
+import heapq
+from collections import deque
+from dbcc.Engine import PROTOCOL_MVCC, ConcurrencyControl
+from dbcc.Events import ConsoleSink, EventSink
+from dbcc.Parser import ItemTable
+from dbcc.mvcc.Lib import MVCCTransaction, Operation, VersionControl, TransactionItem
+
+def format_event(event: str, fields: dict):
+    '''
+        Turn an MVCC event into colored text for ConsoleSink
+        params:
+        event = event name
+        fields = event payload
+    '''
+    color = '\033[92m' if fields.get("success", True) else '\033[91m'
+    t_num = fields.get("t_num")
+    if event in ("read", "write"):
+        versions = "".join(f"{version}; " for version in fields["versions"])
+        if event == "read":
+            return color + f"[READ]       | T{t_num} on {fields['item']} from DB | Version {fields['item']} : {versions}"
+        return color + f"[WRITE]      | T{t_num} on {fields['item']} to DB   | Version {fields['item']} : {versions}"
+    if event == "commit":
+        return color + f"[COMMIT]     | T{t_num}"
+    if event == "abort":
+        return '\033[93m' + f"[ABORT]      | T{t_num} rolled back"
+    if event == "vacuum":
+        return '\033[90m' + f"[VACUUM]     | Horizon {fields['horizon']} | Reclaimed {fields['reclaimed']} versions ({fields['bytes']} bytes)"
+    if event == "done":
+        return '\033[0m'
+    return None
+
+# Versions created between two vacuum passes
+VACUUM_THRESHOLD = 1024
+
+class MVCC(ConcurrencyControl):
+    '''
+    Class MVCC, implementing MVCC Timestamp Ordering Protocol functionalities
+    '''
+    name = PROTOCOL_MVCC
+
+    def __init__(self, sink: EventSink = None, vacuum_threshold: int = VACUUM_THRESHOLD, items: ItemTable = None):
+        '''
+            Initiate needed variables
+            params:
+            sink = receiver of the simulation events, ConsoleSink with format_event if not given
+            vacuum_threshold = number of new versions that triggers a vacuum pass, 0 to never vacuum
+            items = item table the operations are interned in, a new one is created if not given
+        '''
+        super().__init__(sink if sink is not None else ConsoleSink(format_event), items)
+        self.current_timestamp = 0
+        # Transaction registry keyed by t_num, dict keeps insertion order for iteration
+        self.transactions: dict[int, MVCCTransaction] = {}
+        self.version_controller = VersionControl()
+        self.vacuum_threshold = vacuum_threshold
+        # Transactions that have not committed yet, their timestamps bound the vacuum horizon
+        self.active: dict[int, MVCCTransaction] = {}
+        # Heap of (timestamp, t_num) of committed transactions, forgotten once below the horizon
+        self.committed: list[tuple[int, int]] = []
+        # Low-water mark of the last vacuum, no live or future transaction can have a lower timestamp
+        self.horizon = 0
+        # Lowest transaction number not admitted yet and the admitted numbers above it. A transaction showing up later
+        # may take any number from there on as its timestamp, so vacuum keeps what it can see.
+        # Numbers start at 1 like the schedules, timestamp 0 belongs to the initial versions
+        self.unseen = 1
+        self.seen: set[int] = set()
+        self.max_timestamp = 0
+        # Highest timestamp handed out by next_timestamp, a new transaction may not take it as its own
+        self.issued = 0
+        # Reads-from dependency graph, writer id to the ids that read one of its versions and back
+        self.readers: dict[int, dict[int, None]] = {}
+        self.reads_from: dict[int, dict[int, None]] = {}
+
+    def find_transaction(self, t_num: int):
+        '''
+            Find transaction with spesific id
+            params:
+            t_num = transaction id looked for
+        '''
+        return self.transactions.get(t_num)
+
+    def prepare_item(self, op: Operation):
+        '''
+            Setup the initial conndition of MVCC Timestamp Ordering
+            params:
+            op = operation
+        '''
+        # Check if the operation is not commit and not exist in version control
+        if (op.operation != "C" and op.item not in self.version_controller.map):
+            new_item = TransactionItem(op.item)
+            self.version_controller.add_new_version(new_item)
+
+    def prepare(self, op: Operation):
+        '''
+            Preparation of everytime the operation need to be executed
+            params:
+            op = operation
+        '''
+        # Check whether the transaction already exist before
+        trx = self.find_transaction(op.t_num)
+        
+        # If not exist, create a new transaction with timestamp = t_num
+        if trx is None:
+            if op.t_num > self.issued:
+                timestamp = op.t_num
+                self.current_timestamp += 1     # Add new timestamp
+            # Its number may be taken by a restarted transaction already, timestamps are never reused
+            else:
+                timestamp = self.next_timestamp()
+            self.admit(op.t_num)
+            new_trx = MVCCTransaction(op.t_num, timestamp)
+            new_trx.arr_process.append(op)      # Add to its array process
+            self.transactions[new_trx.t_num] = new_trx   # Add to global MVCC transaction registry
+            self.active[new_trx.t_num] = new_trx
+            self.max_timestamp = max(self.max_timestamp, timestamp)
+        # Else, just add the operation to its array process
+        else:
+            trx.arr_process.append(op)
+
+    def process(self, op: Operation):
+        '''
+            Executing the operations
+            params:
+            op = operation
+        '''
+        success = False
+        # Read operation
+        if (op.operation == "R"):
+            success = self.process_read(op)
+            self.sink.emit("read", t_num=op.t_num, item=op.item, success=success,
+                           versions=self.version_controller.get(op.item))
+        # Write operation
+        elif (op.operation == "W"):
+            success = self.process_write(op)
+            self.sink.emit("write", t_num=op.t_num, item=op.item, success=success,
+                           versions=self.version_controller.get(op.item), value=op.value)
+        # Commit operation
+        elif (op.operation == "C"):
+            success = self.process_commit(op)
+            trx = self.find_transaction(op.t_num)
+            # The timestamp gives the place of the transaction in the equivalent serial order
+            self.sink.emit("commit", t_num=op.t_num, success=success, timestamp=trx.timestamp)
+            if success:
+                self.counts['commits'] += 1
+                self.active.pop(op.t_num, None)
+                heapq.heappush(self.committed, (trx.timestamp, op.t_num))
+
+        return success
+
+    def process_read(self, op: Operation):
+        '''
+            Simulate read transaction from DB
+            params:
+            op = operations to be read
+        '''
+        # Get the operation timestamp
+        op_ts = self.find_transaction(op.t_num).timestamp
+        # Qk is the version with the largest W-TS(Qk) <= TS(Ti)
+        version = self.version_controller.visible(op.item, op_ts)
+        if version is None:
+            return False
+
+        # Set R-TS(Qk) = max(R-TS(Qk), TS(Ti))
+        if version.read_ts < op_ts:
+            version.read_ts = op_ts
+        # Ti read the value written by Qk, add to the dependency graph in case rollback needed
+        if version.writer is not None and version.writer != op.t_num and version.writer in self.transactions:
+            self.add_dependency(version.writer, op.t_num)
+
+        return True
+
+    def process_write(self, op: Operation):
+        '''
+            Simulate write transaction to DB
+            params:
+            op = operations to be wrote
+        '''
+        # Get the operation timestamp
+        op_ts = self.find_transaction(op.t_num).timestamp
+        # Qk is the version with the largest W-TS(Qk) <= TS(Ti)
+        version = self.version_controller.visible(op.item, op_ts)
+
+        # Holds TS(Ti) < R-TS(Qk), then transaction Ti is rolled back
+        if version is None or op_ts < version.read_ts:
+            return False
+
+        # Holds TS(Ti) = W-TS(Qk), the contents of Qk are overwritten
+        if (op_ts == version.write_ts):
+            return True
+
+        # Otherwise, a new version Qi of Q is created
+        # W-TS(Qi) and R-TS(Qi) are initialized to TS(Ti)
+        new_version = TransactionItem(op.item, version = op_ts, read_ts = op_ts, write_ts = op_ts, writer = op.t_num)
+
+        # Add to new version on controller and new created items on that transaction
+        self.version_controller.add_new_version(new_version)
+        self.find_transaction(op.t_num).created_items.append(new_version)
+
+        return True
+
+    def process_commit(self, _: Operation):
+        '''
+            Simulate transaction commit
+            Since protocol guarantees serializability, always return true
+        '''
+        return True
+
+    def next_timestamp(self):
+        '''
+            Hand out a new timestamp for a restarted or late transaction.
+            It is above every timestamp handed out so far, so it never falls below the vacuum horizon
+            and never collides with the timestamp of a running transaction
+        '''
+        self.current_timestamp = max(self.current_timestamp, self.max_timestamp) + 1
+        self.max_timestamp = self.current_timestamp
+        self.issued = self.current_timestamp
+        return self.current_timestamp
+
+    def admit(self, t_num: int):
+        '''
+            Record that a transaction number showed up, moving the lowest number not admitted yet past it
+            params:
+            t_num = transaction id
+        '''
+        self.seen.add(t_num)
+        while self.unseen in self.seen:
+            self.seen.discard(self.unseen)
+            self.unseen += 1
+
+    def vacuum(self):
+        '''
+            Reclaim the versions no live or future transaction can read.
+            The horizon is the oldest active timestamp, bounded by the lowest transaction number not admitted yet
+            since a transaction showing up later runs with its own number, or the next timestamp when neither exists.
+            Committed transactions below it are forgotten since no rollback can reach them anymore
+        '''
+        horizon = min((trx.timestamp for trx in self.active.values()), default = self.max_timestamp + 1)
+        horizon = min(horizon, self.unseen)
+        self.horizon = max(self.horizon, horizon)
+
+        while self.committed and self.committed[0][0] < self.horizon:
+            timestamp, t_num = heapq.heappop(self.committed)
+            trx = self.find_transaction(t_num)
+            # Skip entries left behind by a committed transaction that was rolled back and committed again
+            if trx is not None and trx.timestamp == timestamp and t_num not in self.active:
+                del self.transactions[t_num]
+                self.remove_dependencies(t_num)
+
+        reclaimed, saved = self.version_controller.vacuum(self.horizon)
+        self.sink.emit("vacuum", horizon=self.horizon, reclaimed=reclaimed, bytes=saved)
+
+    def add_dependency(self, writer: int, reader: int):
+        '''
+            Record that reader read a version written by writer
+            params:
+            writer = id of the transaction that created the version
+            reader = id of the transaction that read it
+        '''
+        self.readers.setdefault(writer, {})[reader] = None
+        self.reads_from.setdefault(reader, {})[writer] = None
+
+    def remove_dependencies(self, t_num: int):
+        '''
+            Drop every edge of a transaction from the dependency graph, its reads are undone or can no longer be rolled back
+            params:
+            t_num = transaction id
+        '''
+        for writer in self.reads_from.pop(t_num, ()):
+            self.readers[writer].pop(t_num, None)
+        for reader in self.readers.pop(t_num, ()):
+            self.reads_from[reader].pop(t_num, None)
+
+    def handle_abort(self, t_num: int) -> list[int]:
+        '''
+            Handle abort and simulate full rollback (including cascading) mechanism.
+            The cascade set is found with one depth-first walk of the dependency graph,
+            every transaction is rolled back once however many of its versions were read
+            params:
+            t_num = transaction id
+        '''
+        aborted: dict[int, None] = {}
+        stack = [t_num]
+        while stack:
+            id = stack.pop()
+            if id in aborted:
+                continue
+            aborted[id] = None
+            self.counts['aborts'] += 1
+            # A transaction no longer active had committed, its commit is undone too and counted again once it is re-run
+            committed = id not in self.active
+            if committed:
+                self.counts['commits'] -= 1
+            self.sink.emit("abort", t_num=id, committed=committed)
+
+            # Remove the versions the transaction created from their chains
+            for item in self.find_transaction(id).created_items:
+                self.version_controller.remove(item)
+
+            # Every reader of those versions is rolled back too, pushed reversed so they are visited in read order
+            readers = [reader for reader in self.readers.get(id, ()) if reader not in aborted]
+            self.remove_dependencies(id)
+            stack.extend(reversed(readers))
+
+        # Return array of transaction id aborted
+        return list(aborted)
+
+    def restart(self, t_num: int) -> list[int]:
+        '''
+            Roll back a transaction with its cascade and give every aborted transaction a new timestamp
+            Return the aborted transaction ids, in the order they should be re-run
+            params:
+            t_num = transaction id
+        '''
+        aborted_ids = self.handle_abort(t_num)
+        self.renew(aborted_ids)
+        return aborted_ids
+
+    def renew(self, aborted_ids: list[int]):
+        '''
+            Give every rolled back transaction a new timestamp before it is re-run
+            params:
+            aborted_ids = transaction ids
+        '''
+        for id in aborted_ids:
+            trx = self.find_transaction(id)
+            trx.timestamp = self.next_timestamp()
+            trx.created_items = []
+        self.counts['restarts'] += len(aborted_ids)
+
+    def run_operation(self, op: Operation):
+        '''
+            Run every single operations exist on every transaction exists
+            params:
+            op = operation
+        '''
+        # Process the operation and get the process status
+        if self.process(op):
+            return True
+
+        # If not sucess, handle the abort mechanism based on transaction id
+        self.rerun(self.restart(op.t_num))
+        return False
+
+    def rerun(self, aborted_ids: list[int]):
+        '''
+            Re-run aborted transactions from a queue, a transaction aborted again while
+            re-running stops there and is queued once more instead of recursing
+            params:
+            aborted_ids = transactions to re-run, in order
+        '''
+        pending = deque(aborted_ids)
+        queued = set(pending)
+        while pending:
+            id = pending.popleft()
+            queued.discard(id)
+
+            # Re-run all the operations on that transaction
+            for op in self.find_transaction(id).arr_process:
+                if self.process(op):
+                    continue
+                for aborted in self.restart(op.t_num):
+                    if aborted not in queued:
+                        queued.add(aborted)
+                        pending.append(aborted)
+                break
+
+    def abort(self, t_num: int):
+        '''
+            Roll back a running transaction for good through the abort path, with its cascade.
+            The transactions that read its versions are re-run, the transaction itself is forgotten
+            params:
+            t_num = transaction id
+        '''
+        if t_num not in self.active:
+            return
+        cascade = self.handle_abort(t_num)[1:]
+        del self.transactions[t_num]
+        del self.active[t_num]
+        self.renew(cascade)
+        self.rerun(cascade)
+
+    def submit(self, parsed):
+        '''
+            Process the next operation of the schedule, vacuuming once enough versions piled up
+            params:
+            parsed = operation parsed with self.items, or its text
+        '''
+        op = Operation(self.parse(parsed), self.items)
+        self.counts['ops'] += 1
+        # Prepare the initial version of the item the first time it is seen
+        self.prepare_item(op)
+        self.prepare(op)
+        success = self.run_operation(op)
+        if self.vacuum_threshold and self.version_controller.added >= self.vacuum_threshold:
+            self.vacuum()
+        return success
+
+    def finish(self):
+        '''
+            The schedule is over, every abort was already re-run
+        '''
+        self.sink.emit("done")
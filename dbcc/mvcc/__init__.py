@@ -0,0 +1,4 @@
+'''
+Multiversion Timestamp Ordering engine
+'''
+from dbcc.mvcc.Mvcc import MVCC
@@ -0,0 +1,60 @@
+import math
+from dbcc.Parser import ItemTable, ScheduleOp
+
+class Operation:
+    '''
+    Class Operation, all possible ops on a transaction
+    Slotted since the simulator keeps one per operation of every active transaction
+    '''
+    __slots__ = ('operation', 't_num', 'item', 'value')
+
+    def __init__(self, op: ScheduleOp, items: ItemTable):
+        '''
+            Initiate needed variables
+            params:
+            op = parsed operation, example R1(A)
+            items = item table the operation item was interned in
+        '''
+        self.operation = op.kind
+        self.t_num = op.t_num
+        # The name comes from the item table, so every operation on an item shares one string
+        self.item = items.name(op.item) if op.item is not None else None
+        self.value = op.value
+            
+    def __str__(self):
+        '''
+            Overriding to print as a string
+        '''
+        if (self.operation == "W"):
+            return f'T{self.t_num} on {self.item} to LOCAL'
+        else:
+            return f'T{self.t_num} on {self.item} from DB '
+        
+        
+class OCCTransaction:
+    '''
+    Class OCCTransaction, to handle OCC transaction components
+    '''
+    __slots__ = ('t_num', 'read_set', 'write_set', 'start', 'validation', 'finish', 'arr_process')
+
+    def __init__(self, t_num: int) -> None:
+        '''
+            Initiate needed variables
+            params:
+            t_num = transaction number
+            start, validation, finish = phase timestamps, infinite until the phase is reached
+        '''
+        self.t_num: int = t_num                  
+        self.read_set: set[str] = set()
+        self.write_set: set[str] = set()
+        self.arr_process: list[Operation] = []
+        self.reset_timestamps()
+
+    def reset_timestamps(self):
+        '''
+            Forget the phase timestamps, used when the transaction restarts
+        '''
+        self.start = math.inf
+        self.validation = math.inf
+        self.finish = math.inf
+        
\ No newline at end of file
@@ -0,0 +1,428 @@
+import heapq
+import math
+from collections import deque
+from dbcc.Engine import PROTOCOL_OCC, ConcurrencyControl
+from dbcc.Events import ConsoleSink, EventSink
+from dbcc.Parser import ItemTable
+from dbcc.occ.Lib import OCCTransaction, Operation
+from dbcc.occ.Store import KeyValueStore, Workspace
+
+def format_event(event: str, fields: dict):
+    '''
+        Turn an OCC event into colored text for ConsoleSink
+        params:
+        event = event name
+        fields = event payload
+    '''
+    color = '\033[92m' if fields.get("success", True) else '\033[91m'
+    t_num = fields.get("t_num")
+    if event == "read":
+        return color + f"[READ]       | T{t_num} on {fields['item']} from DB  | Read Set T{t_num} : {sorted(fields['read_set'])}"
+    if event == "tempwrite":
+        return color + f"[TEMPWRITE]  | T{t_num} on {fields['item']} to LOCAL | Write Set T{t_num} : {sorted(fields['write_set'])}"
+    if event == "validate":
+        return color + f"[VALIDATE]   | T{t_num}"
+    if event == "write":
+        return color + f"[WRITE]      | T{t_num} on {fields['item']} to DB"
+    if event == "commit":
+        return color + f"[COMMIT]     | T{t_num}"
+    if event == "abort":
+        return '\033[93m' + f"[ABORT]      | T{t_num} rolled back"
+    if event == "retry":
+        return '\033[93m' + f"[RETRY]      | T{t_num} restarted, attempt {fields['attempt']}"
+    if event == "giveup":
+        return '\033[91m' + f"[GIVE UP]    | T{t_num} dropped after {fields['retries']} retries"
+    if event == "stats":
+        return '\033[90m' + f"[STATS]      | T{t_num} aborted {fields['aborts']} times, retried {fields['retries']} times"
+    if event == "done":
+        return '\033[0m'
+    return None
+
+# Restarts a transaction gets before it is dropped
+RETRY_LIMIT = 16
+# Logical time an aborted transaction waits before its first restart, doubled on every further restart
+BACKOFF = 0
+
+class OCC(ConcurrencyControl):
+    '''
+    Class OCC, implementing OCC Protocol functionalities
+    Writes go to a private workspace of the transaction and are installed in the store once it is validated.
+    A write without a value stores the id of the writing transaction
+    '''
+    name = PROTOCOL_OCC
+
+    def __init__(self, sink: EventSink = None, retry_limit: int = RETRY_LIMIT, backoff: int = BACKOFF,
+                 items: ItemTable = None, store: KeyValueStore = None) -> None:
+        '''
+            Initiate needed variables
+            params:
+            sink = receiver of the simulation events, ConsoleSink with format_event if not given
+            retry_limit = restarts before an aborted transaction is dropped, 0 to always restart
+            backoff = timestamps an aborted transaction waits before restarting, doubled on every retry
+            items = item table the operations are interned in, a new one is created if not given
+            store = committed item values, an empty one is created if not given
+        '''
+        super().__init__(sink if sink is not None else ConsoleSink(format_event), items)
+        self.current_timestamp = 0
+        # Transaction registry keyed by t_num, dict keeps insertion order for iteration
+        self.transactions: dict[int, OCCTransaction] = {}
+        # Committed transactions ordered by finish timestamp, only kept while an active transaction overlaps them
+        self.committed: deque[OCCTransaction] = deque()
+        # Heap of (start timestamp, t_num) of the active transactions. An entry goes stale once its transaction
+        # commits, aborts or restarts with a new start, and is only dropped when it reaches the top
+        self.starts: list[tuple[int, int]] = []
+        self.store = store if store is not None else KeyValueStore()
+        # Private workspace of each active transaction that wrote something
+        self.workspaces: dict[int, Workspace] = {}
+        self.retry_limit = retry_limit
+        self.backoff = backoff
+        # Heap of (restart timestamp, t_num) of aborted transactions waiting for their restart
+        self.restarts: list[tuple[int, int]] = []
+        self.restarting: set[int] = set()
+        # Transactions dropped after too many retries, their later operations are ignored
+        self.gave_up: set[int] = set()
+        # Aborts and restarts per transaction id, kept after the transaction commits
+        self.aborts: dict[int, int] = {}
+        self.retries: dict[int, int] = {}
+        
+    def find_transaction(self, t_num: int):
+        '''
+            Find transaction with spesific id
+            params:
+            t_num = transaction id looked for
+        '''
+        return self.transactions.get(t_num)
+        
+    def prepare(self, op: Operation):
+        '''
+            Setup the initial condition of OCC
+            params:
+            op = operation
+        '''
+        # Check whether the transaction already exist before
+        trx = self.find_transaction(op.t_num)
+        
+        # If not exist, create a new transaction
+        if trx is None:
+            new_trx = OCCTransaction(op.t_num)
+            new_trx.arr_process.append(op)     
+            new_trx.start = self.current_timestamp
+            self.transactions[new_trx.t_num] = new_trx
+            heapq.heappush(self.starts, (new_trx.start, new_trx.t_num))
+            self.current_timestamp += 1
+        # Else, just add the operation to its array process
+        else:
+            trx.arr_process.append(op)
+            
+    def process(self, op: Operation):
+        '''
+            Executing the operations
+            params:
+            op = operation
+        '''
+        success = False
+        trx = self.find_transaction(op.t_num)
+        read_set = trx.read_set
+        write_set = trx.write_set
+        
+        # Read operation
+        if (op.operation == "R"):
+            success = self.process_read(op)
+            self.sink.emit("read", t_num=op.t_num, item=op.item, success=success, read_set=read_set,
+                           value=self.value(op.t_num, op.item))
+        # Write operation
+        elif (op.operation == "W"):
+            success = self.process_tempwrite(op)
+            self.sink.emit("tempwrite", t_num=op.t_num, item=op.item, success=success, write_set=write_set,
+                           value=self.workspaces[op.t_num].writes[op.item])
+        # Commit operation
+        elif (op.operation == "C"):
+            success = self.process_validate(op)
+            self.sink.emit("validate", t_num=op.t_num, success=success)
+            if success:
+                self.write(op)
+
+        return success
+
+    def value(self, t_num: int, item: str):
+        '''
+            Value of an item as a transaction sees it, its own write first
+            params:
+            t_num = transaction id
+            item = item name
+        '''
+        workspace = self.workspaces.get(t_num)
+        return workspace.read(item) if workspace is not None else self.store.get(item)
+    
+    def process_read(self, op: Operation):
+        '''
+            Simulate read transaction from DB
+            params:
+            op = operations to be read
+        '''
+        # Add the timestamp
+        self.current_timestamp += 1 
+        
+        # Get the operation transaction
+        trx = self.find_transaction(op.t_num)
+        
+        # Add to read_set tx
+        trx.read_set.add(op.item)
+            
+        return True
+    
+    def process_tempwrite(self, op: Operation):
+        '''
+            Simulate temp write transaction before actually write to DB
+            params:
+            op = operations to be wrote temporary
+        '''
+        # Add the timestamp
+        self.current_timestamp += 1
+        # Write to the private workspace, created on the first write
+        workspace = self.workspaces.get(op.t_num)
+        if workspace is None:
+            workspace = self.workspaces[op.t_num] = Workspace(self.store)
+        workspace.write(op.item, op.value if op.value is not None else op.t_num)
+        
+        # Get the operation transaction
+        trx = self.find_transaction(op.t_num)
+        
+        # Add to write_set tx
+        trx.write_set.add(op.item)
+            
+        return True
+    
+    def process_commit(self, op: Operation):
+        '''
+            Simulate transaction commit
+            op = operations to be commited
+        '''
+         # Add the timestamp
+        self.current_timestamp += 1
+        
+        # Get the operation transaction
+        trx = self.find_transaction(op.t_num)
+        # Set the finish timestamp
+        trx.finish = self.current_timestamp
+        
+        # Move the transaction from the active registry to the validation window
+        del self.transactions[op.t_num]
+        self.workspaces.pop(op.t_num, None)
+        self.committed.append(trx)
+        self.counts['commits'] += 1
+        self.prune()
+        
+        self.sink.emit("commit", t_num=op.t_num)
+    
+    def prune(self):
+        '''
+            Garbage collect committed transactions that finished before every active transaction started,
+            they can never fail the validation of an active or future transaction
+        '''
+        while self.starts:
+            (start, t_num) = self.starts[0]
+            trx = self.transactions.get(t_num)
+            if trx is not None and trx.start == start:
+                break
+            heapq.heappop(self.starts)
+        low_water = self.starts[0][0] if self.starts else math.inf
+        while self.committed and self.committed[0].finish < low_water:
+            self.committed.popleft()
+    
+    def process_validate(self, op: Operation):
+        '''
+            Validation mechanism over transaction before finally commited
+            params:
+            op = operations to be validated
+        '''
+        self.current_timestamp += 1  # Add the timestamp
+        
+        # Get the operation transaction
+        tj = self.find_transaction(op.t_num)
+        # Set the transaction validation timestamp
+        tj.validation = self.current_timestamp
+        tj_startTS = tj.start
+        
+        # Every Ti with TS(Ti) < TS(Tj) is already committed, walk them from the latest finish timestamp
+        for ti in reversed(self.committed):
+            # Holds finishTS(Ti) < startTS(Tj), then Ti and every earlier Ti do not overlap Tj
+            if ti.finish < tj_startTS:
+                break
+            
+            # Holds startTS(Tj) < finishTS(Ti) < validationTS(Tj)
+            # And set of data items written by Ti must not intersect with the set of data items read by Tj
+            # If intersect, then invalid, Tj is aborted
+            if not ti.write_set.isdisjoint(tj.read_set):
+                return False
+                    
+        return True
+    
+    def write(self, op: Operation):
+        '''
+            Simulate write transaction to DB
+            params:
+            op = operation to be written
+        '''
+        self.current_timestamp += 1  # Add the timestamp
+        
+        # Install the workspace in the store at once, then report every item written
+        trx = self.find_transaction(op.t_num)
+        workspace = self.workspaces.get(op.t_num)
+        if workspace is not None:
+            self.store.install(workspace.writes)
+            self.counts['installed'] += len(workspace.writes)
+        for var in sorted(trx.write_set):
+            self.sink.emit("write", t_num=op.t_num, item=var, value=workspace.writes[var])
+
+        # End all the write process with transaction commit
+        self.process_commit(op)
+    
+    def handle_abort(self, t_num: int) -> list[int]:
+        '''
+            Handle abort and simulate full rollback (including cascading) mechanism
+            params:
+            t_num = transaction id
+        '''
+        self.sink.emit("abort", t_num=t_num)
+        
+        # Get the transaction and add it to aborted transaction array
+        aborted: list[int] = [t_num]
+        
+        return aborted
+            
+    def restart_later(self, t_num: int):
+        '''
+            Roll back the aborted transactions and queue their restart, after the backoff in logical time.
+            A transaction out of retries is dropped instead
+            params:
+            t_num = transaction id
+        '''
+        for id in self.handle_abort(t_num):
+            self.aborts[id] = self.aborts.get(id, 0) + 1
+            self.counts['aborts'] += 1
+
+            # Forget everything the transaction did
+            trx = self.find_transaction(id)
+            trx.read_set = set()
+            trx.write_set = set()
+            self.workspaces.pop(id, None)
+            trx.reset_timestamps()
+
+            retries = self.retries.get(id, 0)
+            if self.retry_limit and retries >= self.retry_limit:
+                del self.transactions[id]
+                self.gave_up.add(id)
+                self.sink.emit("giveup", t_num=id, retries=retries)
+                continue
+
+            delay = self.backoff << retries if self.backoff else 0
+            heapq.heappush(self.restarts, (self.current_timestamp + delay, id))
+            self.restarting.add(id)
+
+    def run_restarts(self, drain: bool = False):
+        '''
+            Re-run every queued transaction whose backoff is over, one that fails again is queued again
+            params:
+            drain = run the whole queue, moving the logical time forward to each restart
+        '''
+        while self.restarts and (drain or self.restarts[0][0] <= self.current_timestamp):
+            due, id = heapq.heappop(self.restarts)
+            if id not in self.restarting:
+                continue
+            self.restarting.discard(id)
+            self.retries[id] = self.retries.get(id, 0) + 1
+            self.counts['restarts'] += 1
+
+            # Set the new transaction timestamp
+            self.current_timestamp = max(self.current_timestamp, due) + 1
+            self.find_transaction(id).start = self.current_timestamp
+            heapq.heappush(self.starts, (self.current_timestamp, id))
+            self.sink.emit("retry", t_num=id, attempt=self.retries[id])
+
+            # Re-run all the operations on that transaction
+            for op in self.find_transaction(id).arr_process:
+                if not self.process(op):
+                    self.restart_later(id)
+                    break
+
+    def run_operation(self, op: Operation):
+        '''
+            Run every single operations exist on every transaction exists
+            params:
+            op = operation
+        '''
+        # A transaction waiting for its restart runs the operation when it is re-run
+        if op.t_num in self.restarting:
+            return False
+
+        # Process the operation and get the process status
+        if not self.process(op):
+            # If not sucess, handle the abort mechanism based on transaction id
+            self.restart_later(op.t_num)
+            return False
+        return True
+
+    def submit(self, parsed):
+        '''
+            Process the next operation of the schedule, then the restarts whose backoff is over
+            params:
+            parsed = operation parsed with self.items, or its text
+        '''
+        op = Operation(self.parse(parsed), self.items)
+        self.counts['ops'] += 1
+        if op.t_num in self.gave_up:
+            return False
+        self.prepare(op)
+        success = self.run_operation(op)
+        self.run_restarts()
+        return success
+
+    def abort(self, t_num: int):
+        '''
+            Roll back a running transaction for good, its workspace is dropped and it is never restarted
+            params:
+            t_num = transaction id
+        '''
+        if t_num not in self.transactions:
+            return
+        self.sink.emit("abort", t_num=t_num)
+        self.aborts[t_num] = self.aborts.get(t_num, 0) + 1
+        self.counts['aborts'] += 1
+        del self.transactions[t_num]
+        self.workspaces.pop(t_num, None)
+        # A queued restart is skipped once it is due
+        self.restarting.discard(t_num)
+        self.prune()
+
+    def waiting(self):
+        '''
+            Number of aborted transactions waiting for their restart
+        '''
+        return len(self.restarting)
+
+    def blocked(self, t_num: int) -> bool:
+        '''
+            Whether a transaction is waiting for its restart, its operations run again then
+            params:
+            t_num = transaction id
+        '''
+        return t_num in self.restarting
+
+    def stats(self) -> dict:
+        '''
+            Counters of the schedule so far, with the items in the store and the writes installed in it
+        '''
+        stats = super().stats()
+        stats.update(keys=len(self.store), installed=self.counts['installed'])
+        return stats
+
+    def finish(self):
+        '''
+            The schedule is over, restart whatever is still waiting and report the aborts and retries
+        '''
+        self.run_restarts(drain = True)
+
+        for t_num, aborts in self.aborts.items():
+            self.sink.emit("stats", t_num=t_num, aborts=aborts, retries=self.retries.get(t_num, 0))
+        self.sink.emit("done")
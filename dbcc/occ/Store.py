@@ -0,0 +1,76 @@
+from typing import Hashable, Optional
+
+
+class KeyValueStore:
+    '''
+    Class KeyValueStore, the committed value of every item written so far
+    '''
+    __slots__ = ('data', 'installs')
+
+    def __init__(self, data: Optional[dict] = None) -> None:
+        '''
+            Initiate needed variables
+            params:
+            data = initial item values, copied
+            installs = write sets installed so far
+        '''
+        self.data: dict = dict(data) if data else {}
+        self.installs = 0
+
+    def get(self, key: Hashable, default=None):
+        '''
+            Committed value of an item
+            params:
+            key = item name
+            default = value of an item never written
+        '''
+        return self.data.get(key, default)
+
+    def install(self, writes: dict):
+        '''
+            Make the writes of a validated transaction visible, all of them in one step
+            params:
+            writes = item name to the value written
+        '''
+        self.data.update(writes)
+        self.installs += 1
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+
+class Workspace:
+    '''
+    Class Workspace, private copy on write view of the store for one transaction
+    Reads fall through to the store until the transaction writes the item, only the written items are kept,
+    so a workspace costs as much as its write set whatever the size of the store
+    '''
+    __slots__ = ('store', 'writes')
+
+    def __init__(self, store: KeyValueStore) -> None:
+        '''
+            Initiate needed variables
+            params:
+            store = committed values under the workspace
+            writes = item name to the value written by the transaction
+        '''
+        self.store = store
+        self.writes: dict = {}
+
+    def read(self, key: Hashable):
+        '''
+            Value the transaction sees, its own write if any, else the committed one
+            params:
+            key = item name
+        '''
+        writes = self.writes
+        return writes[key] if key in writes else self.store.get(key)
+
+    def write(self, key: Hashable, value):
+        '''
+            Buffer a write until the transaction is validated
+            params:
+            key = item name
+            value = value written
+        '''
+        self.writes[key] = value
@@ -0,0 +1,5 @@
+'''
+Optimistic Concurrency Control engine with backward validation
+'''
+from dbcc.occ.Occ import OCC
+from dbcc.occ.Store import KeyValueStore, Workspace
@@ -0,0 +1,346 @@
+import threading
+import time
+from collections import Counter, deque
+from dbcc.Engine import PROTOCOL_2PL, Histogram
+from dbcc.Events import EventSink
+from dbcc.Parser import READ, WRITE, ItemTable, ScheduleParser
+from dbcc.twopl.LockManager import LockManager
+from dbcc.twopl.twoPL import POLICIES, VICTIM_LOCKS, VICTIM_OPS, VICTIMS, WAIT_DIE, WOUND_WAIT
+
+_EVENTS = {READ : 'read', WRITE : 'write'}
+
+def transaction_programs(operations) :
+    '''
+    Mengelompokkan operasi read dan write schedule per transaksi, urutan antar transaksi diabaikan
+    karena pada mode live urutan ditentukan oleh thread yang berjalan bersamaan.
+    Mengembalikan dict nomor transaksi -> daftar ScheduleOp, setiap transaksi commit setelah operasi terakhirnya
+    Params :
+    - operations : iterable ScheduleOp, contoh FileHandler.operations(LiveTwoPL.parser)
+    '''
+    programs = {}
+    for op in operations :
+        if (op.kind == READ or op.kind == WRITE) :
+            programs.setdefault(op.t_num, []).append(op)
+        else :
+            programs.setdefault(op.t_num, [])
+    return programs
+
+class TransactionAborted(Exception) :
+    '''
+    Dilempar di thread transaksi yang harus di-rollback.
+    item dan op adalah lock yang ditunggu sebelum transaksi dijalankan ulang, None jika bisa langsung diulang.
+    winner adalah transaksi yang menyebabkan rollback, jika ada ia ditunggu sampai mendapat lock item tersebut
+    '''
+    def __init__(self, t_num, item = None, op = None, winner = None) :
+        super().__init__(f"T{t_num} rolled back")
+        self.t_num = t_num
+        self.item = item
+        self.op = op
+        self.winner = winner
+
+class LiveTwoPL :
+    '''
+    Two phase locking (rigorous) untuk klien yang benar-benar berjalan bersamaan.
+    Setiap transaksi berjalan di thread-nya sendiri dan benar-benar diblokir pada condition variable
+    per item saat lock bertabrakan, lalu dibangunkan saat lock item tersebut dilepas.
+    Penanganan deadlock sama dengan TwoPL : wound-wait, wait-die, atau deteksi siklus waits-for graph.
+    Transaksi yang terluka (wound) baru me-rollback dirinya pada operasi atau commit berikutnya,
+    atau langsung jika sedang menunggu lock
+    '''
+    name = PROTOCOL_2PL
+
+    def __init__(self, policy = WOUND_WAIT, victim = VICTIM_OPS, items = None, sink = None) -> None:
+        '''
+        Params :
+        - policy : strategi penanganan deadlock, WOUND_WAIT, WAIT_DIE atau DETECT
+        - victim : biaya pemilihan korban pada mode DETECT, lihat TwoPL
+        - items : ItemTable tempat nama item di-intern, dibuat baru jika tidak diberikan
+        - sink : EventSink penerima event, dipanggil saat memegang mutex sehingga tidak perlu thread-safe.
+          Default membuang semua event
+        '''
+        if (policy not in POLICIES) :
+            raise Exception(f"Unknown deadlock policy : {policy}")
+        if (victim not in VICTIMS) :
+            raise Exception(f"Unknown victim cost : {victim}")
+        self.policy = policy
+        self.victim = victim
+        self.items = items if items is not None else ItemTable()
+        self.parser = ScheduleParser(self.items)
+        self.sink = sink if sink is not None else EventSink()
+        self.lock_list = LockManager()
+        # Satu mutex melindungi seluruh tabel lock, condition variable per item memakai mutex yang sama
+        self.mutex = threading.Lock()
+        self.conditions = {}
+        # Timestamp transaksi, tetap dipakai saat transaksi dijalankan ulang agar tidak kelaparan
+        self.timestamp = {}
+        self.clock = 0
+        # Transaksi yang harus rollback, nomor transaksi -> (item, op, transaksi penyebab) yang ditunggu sebelum diulang
+        self.aborted = {}
+        # Transaksi yang sedang diblokir, nomor transaksi -> (item, op)
+        self.waiting_on = {}
+        # Operasi yang sudah dieksekusi pada percobaan saat ini, untuk biaya korban
+        self.done = {}
+        self.counts = Counter()
+        # Lama menunggu lock dan lama lock dipegang, dalam mikrodetik
+        self.wait_time = Histogram()
+        self.hold_time = Histogram()
+        self.threads = 0
+        self.wall = 0.0
+
+    def _condition(self, item) :
+        condition = self.conditions.get(item)
+        if (condition is None) :
+            condition = self.conditions[item] = threading.Condition(self.mutex)
+        return condition
+
+    def _check_aborted(self, num) :
+        '''
+        Melempar TransactionAborted jika transaksi num sudah dipilih untuk di-rollback oleh transaksi lain
+        '''
+        if (num in self.aborted) :
+            raise TransactionAborted(num, *self.aborted[num])
+
+    def _abort(self, victim, item, op, winner) :
+        '''
+        Menandai transaksi victim untuk di-rollback demi transaksi winner yang menunggu op pada item,
+        dan membangunkan victim jika sedang menunggu lock
+        '''
+        self.aborted[victim] = (item, op, winner)
+        waiting = self.waiting_on.get(victim)
+        if (waiting is not None) :
+            self.conditions[waiting[0]].notify_all()
+
+    def _waits_for(self, num) :
+        '''
+        Edge waits-for transaksi num, dihitung dari tabel lock.
+        Transaksi yang sudah ditandai rollback tidak punya edge karena akan segera melepas lock-nya
+        '''
+        waiting = self.waiting_on.get(num)
+        if (waiting is None or num in self.aborted) :
+            return []
+        (item, op) = waiting
+        return self.lock_list.conflicts(op, num, item)
+
+    def _find_cycle(self, num, holders) :
+        '''
+        Mencari siklus waits-for yang melewati transaksi num, yang akan menunggu holders, dengan DFS iteratif
+        '''
+        path = [num]
+        work = [iter(holders)]
+        visited = {num}
+        while work :
+            nextNum = next(work[-1], None)
+            if (nextNum is None) :
+                work.pop()
+                path.pop()
+            elif (nextNum == num) :
+                return path
+            elif (nextNum not in visited) :
+                visited.add(nextNum)
+                path.append(nextNum)
+                work.append(iter(self._waits_for(nextNum)))
+        return None
+
+    def _cost(self, num) :
+        if (self.victim == VICTIM_OPS) :
+            return (self.done.get(num, 0), -self.timestamp[num])
+        if (self.victim == VICTIM_LOCKS) :
+            return (len(self.lock_list.held.get(num, ())), -self.timestamp[num])
+        return (-self.timestamp[num],)
+
+    def _resolve(self, op, num, item, holders) :
+        '''
+        Menangani konflik lock sebelum transaksi num menunggu.
+        Melempar TransactionAborted jika num sendiri yang harus di-rollback
+        - wound-wait : pemegang yang lebih muda ditandai rollback, num tetap menunggu sampai lock-nya dilepas
+        - wait-die   : num di-rollback jika ada pemegang yang lebih tua
+        - detect     : siklus yang terbentuk diputus dengan me-rollback transaksi termurah di dalamnya
+        '''
+        name = self.items.name(item)
+        if (self.policy == WOUND_WAIT) :
+            for lockNum in holders :
+                if (self.timestamp[num] < self.timestamp[lockNum] and lockNum not in self.aborted) :
+                    self.sink.emit('abort', op=_EVENTS[op], t_num=num, item=name, victim=lockNum, reason='younger')
+                    self._abort(lockNum, item, op, num)
+        elif (self.policy == WAIT_DIE) :
+            if any(self.timestamp[lockNum] < self.timestamp[num] for lockNum in holders) :
+                self.sink.emit('abort', op=_EVENTS[op], t_num=num, item=name, victim=num, reason='older')
+                raise TransactionAborted(num, item, op)
+        else :
+            cycle = self._find_cycle(num, holders)
+            while (cycle is not None) :
+                victim = min(cycle, key=self._cost)
+                self.sink.emit('abort', op=_EVENTS[op], t_num=num, item=name, victim=victim, reason='deadlock', cycle=cycle)
+                if (victim == num) :
+                    raise TransactionAborted(num, item, op)
+                self._abort(victim, item, op, num)
+                cycle = self._find_cycle(num, holders)
+
+    def _release(self, num) :
+        '''
+        Melepas semua lock transaksi num dan membangunkan thread yang menunggu item tersebut
+        '''
+        items = self.lock_list.release_all(num)
+        now = time.perf_counter()
+        for (item, since) in items.items() :
+            self.hold_time.add(int((now - since) * 1e6))
+            self.conditions[item].notify_all()
+
+    def begin(self, num) :
+        '''
+        Memulai (atau mengulang) transaksi num, timestamp diberikan hanya saat pertama kali dimulai
+        '''
+        with self.mutex :
+            if (num not in self.timestamp) :
+                self.timestamp[num] = self.clock
+                self.clock += 1
+            self.done[num] = 0
+
+    def lock(self, num, op, item) :
+        '''
+        Mengambil lock untuk operasi op (READ atau WRITE) pada item, memblokir thread selama lock bertabrakan.
+        Melempar TransactionAborted jika transaksi harus di-rollback
+        '''
+        with self.mutex :
+            condition = self._condition(item)
+            started = None
+            try :
+                while True :
+                    self._check_aborted(num)
+                    holders = self.lock_list.conflicts(op, num, item)
+                    if (not holders) :
+                        break
+                    self._resolve(op, num, item, holders)
+                    if (started is None) :
+                        started = time.perf_counter()
+                    self.waiting_on[num] = (item, op)
+                    condition.wait()
+            finally :
+                if (self.waiting_on.pop(num, None) is not None) :
+                    # Korban rollback yang menunggu transaksi ini melewati item ikut dibangunkan
+                    condition.notify_all()
+            if (started is not None) :
+                self.wait_time.add(int((time.perf_counter() - started) * 1e6))
+            if (op == READ) :
+                self.lock_list.grant_shared(num, item, time.perf_counter())
+            else :
+                self.lock_list.grant_exclusive(num, item, time.perf_counter())
+            self.done[num] += 1
+            self.counts['ops'] += 1
+            self.sink.emit(_EVENTS[op], t_num=num, item=self.items.name(item), queued=started is not None)
+
+    def commit(self, num) :
+        '''
+        Commit transaksi num dan melepas semua lock-nya, melempar TransactionAborted jika transaksi sudah terluka
+        '''
+        with self.mutex :
+            self._check_aborted(num)
+            self._release(num)
+            self.timestamp.pop(num, None)
+            self.done.pop(num, None)
+            self.counts['commits'] += 1
+            self.sink.emit('commit', t_num=num)
+
+    def rollback(self, num, item = None, op = None, winner = None) :
+        '''
+        Me-rollback transaksi num dan melepas semua lock-nya.
+        Jika item diberikan, thread menunggu sebelum kembali, sama seperti TwoPL yang mengantrekan transaksi
+        yang di-rollback : sampai winner tidak lagi menunggu item, atau jika tanpa winner sampai operasi op
+        pada item tidak lagi bertabrakan. Tanpa itu transaksi yang diulang bisa merebut kembali lock yang baru
+        dilepasnya sebelum winner sempat berjalan, lalu di-rollback lagi tanpa akhir
+        '''
+        with self.mutex :
+            self._release(num)
+            self.aborted.pop(num, None)
+            # Transaksi diulang dari awal, operasi yang sudah dieksekusi tidak lagi dihitung sebagai biaya korban
+            if (num in self.done) :
+                self.done[num] = 0
+            self.counts['aborts'] += 1
+            self.counts['restarts'] += 1
+            if (item is None) :
+                return
+            condition = self._condition(item)
+            started = time.perf_counter()
+            if (winner is not None) :
+                while (self.waiting_on.get(winner, (None,))[0] == item) :
+                    condition.wait()
+            else :
+                while self.lock_list.conflicts(op, num, item) :
+                    condition.wait()
+            self.wait_time.add(int((time.perf_counter() - started) * 1e6))
+
+    def execute(self, num, program, think = 0.0) :
+        '''
+        Menjalankan satu transaksi sampai commit, diulang dari awal setiap kali di-rollback
+        Params :
+        - num : nomor transaksi
+        - program : daftar ScheduleOp read dan write transaksi
+        - think : detik jeda setelah setiap operasi, mensimulasikan kerja transaksi selama memegang lock
+        '''
+        self.begin(num)
+        while True :
+            try :
+                for trans in program :
+                    self.lock(num, trans.kind, trans.item)
+                    if (think) :
+                        time.sleep(think)
+                self.commit(num)
+                return
+            except TransactionAborted as aborted :
+                self.rollback(num, aborted.item, aborted.op, aborted.winner)
+
+    def run(self, programs, threads = 4, think = 0.0) :
+        '''
+        Menjalankan semua transaksi dengan sejumlah thread pekerja, setiap pekerja mengambil transaksi berikutnya
+        yang belum dijalankan. Mengembalikan stats
+        Params :
+        - programs : dict nomor transaksi -> daftar ScheduleOp, lihat transaction_programs
+        - threads : jumlah thread pekerja
+        - think : detik jeda setelah setiap operasi
+        '''
+        if (threads < 1) :
+            raise Exception("threads must be at least 1")
+        queue = deque(programs.items())
+        errors = []
+
+        def worker() :
+            try :
+                while True :
+                    try :
+                        (num, program) = queue.popleft()
+                    except IndexError :
+                        return
+                    self.execute(num, program, think)
+            except Exception as e :
+                errors.append(e)
+
+        workers = [threading.Thread(target=worker, name=f"2pl-worker-{i}") for i in range(threads)]
+        start = time.perf_counter()
+        for thread in workers :
+            thread.start()
+        for thread in workers :
+            thread.join()
+        self.wall += time.perf_counter() - start
+        self.threads = threads
+        if (errors) :
+            raise errors[0]
+        return self.stats()
+
+    def stats(self) :
+        '''
+        Counter, throughput, serta histogram lama menunggu lock (lock_wait_us) dan lama lock dipegang (lock_hold_us)
+        '''
+        return {
+            'protocol': self.name,
+            'mode': 'live',
+            'policy': self.policy,
+            'threads': self.threads,
+            'ops': self.counts['ops'],
+            'commits': self.counts['commits'],
+            'aborts': self.counts['aborts'],
+            'restarts': self.counts['restarts'],
+            'wall_s': round(self.wall, 6),
+            'commits_per_s': round(self.counts['commits'] / self.wall) if self.wall else None,
+            'lock_wait_us': self.wait_time.summary(),
+            'lock_hold_us': self.hold_time.summary(),
+        }
@@ -0,0 +1,101 @@
+class LockManager :
+    '''
+    Tabel lock berbasis hash untuk protokol two phase locking.
+    Setiap item menyimpan himpunan pemegang shared lock dan satu pemilik exclusive lock,
+    sedangkan setiap transaksi menyimpan indeks balik berisi item yang sedang dikuncinya,
+    sehingga acquire, upgrade, dan release semua lock hanya sebanding dengan jumlah lock milik transaksi itu.
+    Indeks balik juga menyimpan waktu lock pertama kali diberikan, untuk mengukur lama lock dipegang.
+    '''
+    def __init__(self) -> None:
+        # dict digunakan sebagai himpunan terurut agar urutan tampilan tetap deterministik
+        self.shared = {}
+        self.exclusive = {}
+        self.held = {}
+
+    def add_item(self, item) :
+        '''
+        Mendaftarkan item ke tabel lock jika belum ada
+        '''
+        if (item not in self.shared) :
+            self.shared[item] = {}
+
+    def holders(self, item) :
+        '''
+        Mengembalikan daftar (tipe lock, nomor transaksi) yang sedang memegang item
+        '''
+        result = [('S', num) for num in self.shared.get(item, ())]
+        owner = self.exclusive.get(item)
+        if (owner is not None) :
+            result.append(('X', owner))
+        return result
+
+    def conflicts(self, op, num, item) :
+        '''
+        Mengembalikan daftar transaksi lain yang lock-nya bertabrakan dengan operasi op milik transaksi num
+        '''
+        owner = self.exclusive.get(item)
+        if (op == 'R') :
+            if (owner is None or owner == num) :
+                return []
+            return [owner]
+        result = [lockNum for lockNum in self.shared.get(item, ()) if lockNum != num]
+        if (owner is not None and owner != num) :
+            result.append(owner)
+        return result
+
+    def covers(self, op, num, item) :
+        '''
+        Apakah lock yang sudah dipegang transaksi num pada item mencukupi operasi op
+        '''
+        if (self.exclusive.get(item) == num) :
+            return True
+        return op == 'R' and num in self.shared.get(item, ())
+
+    def grant_shared(self, num, item, time = None) :
+        '''
+        Memberikan shared lock pada item ke transaksi num pada waktu time
+        '''
+        if (self.exclusive.get(item) == num) : # Exclusive lock sudah mencakup read
+            return
+        self.add_item(item)
+        self.shared[item][num] = None
+        self.held.setdefault(num, {}).setdefault(item, time)
+
+    def grant_exclusive(self, num, item, time = None) :
+        '''
+        Memberikan exclusive lock pada item ke transaksi num pada waktu time, melakukan upgrade jika sudah punya shared lock.
+        Upgrade tetap memakai waktu shared lock diberikan
+        '''
+        self.add_item(item)
+        self.shared[item].pop(num, None)
+        self.exclusive[item] = num
+        self.held.setdefault(num, {}).setdefault(item, time)
+
+    def release_all(self, num) :
+        '''
+        Melepas semua lock milik transaksi num.
+        Mengembalikan dict item yang lock-nya dilepas -> waktu lock tersebut diberikan.
+        '''
+        items = self.held.pop(num, {})
+        for item in items :
+            self.shared[item].pop(num, None)
+            if (self.exclusive.get(item) == num) :
+                del self.exclusive[item]
+        return items
+
+    def release_shared(self, num) :
+        '''
+        Melepas shared lock milik transaksi num, exclusive lock tetap dipegang.
+        Mengembalikan dict item yang lock-nya dilepas -> waktu lock tersebut diberikan.
+        '''
+        held = self.held.get(num, {})
+        items = {item : time for (item, time) in held.items() if self.exclusive.get(item) != num}
+        for item in items :
+            self.shared[item].pop(num, None)
+            del held[item]
+        if (not held) :
+            self.held.pop(num, None)
+        return items
+
+    def __iter__(self) :
+        return iter(self.shared)
@@ -0,0 +1,6 @@
+'''
+Two Phase Locking engine with wound-wait, wait-die or waits-for-graph deadlock handling,
+replaying a schedule (TwoPL) or running each transaction on its own thread (LiveTwoPL)
+'''
+from dbcc.twopl.LiveTwoPL import LiveTwoPL, TransactionAborted
+from dbcc.twopl.twoPL import DETECT, WAIT_DIE, WOUND_WAIT, TwoPL
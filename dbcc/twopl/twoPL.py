@@ -0,0 +1,626 @@
+from collections import Counter, deque
+from dbcc.Engine import PROTOCOL_2PL, ConcurrencyControl, Histogram
+from dbcc.Events import ConsoleSink
+from dbcc.Parser import COMMIT, READ, WRITE, format_op
+from dbcc.twopl.LockManager import LockManager
+
+WOUND_WAIT = 'wound-wait'
+WAIT_DIE = 'wait-die'
+DETECT = 'detect'
+POLICIES = (WOUND_WAIT, WAIT_DIE, DETECT)
+# Biaya korban deadlock pada mode DETECT, korban adalah transaksi dengan biaya terkecil
+VICTIM_OPS = 'ops'
+VICTIM_LOCKS = 'locks'
+VICTIM_YOUNGEST = 'youngest'
+VICTIMS = (VICTIM_OPS, VICTIM_LOCKS, VICTIM_YOUNGEST)
+# Varian 2PL, menentukan kapan lock dilepas :
+# - BASIC    : semua lock dilepas begitu transaksi melewati lock point
+# - STRICT   : shared lock dilepas di lock point, exclusive lock dipegang sampai commit
+# - RIGOROUS : semua lock dipegang sampai commit
+BASIC = 'basic'
+STRICT = 'strict'
+RIGOROUS = 'rigorous'
+VARIANTS = (BASIC, STRICT, RIGOROUS)
+_EVENTS = {READ : 'read', WRITE : 'write'}
+
+def _describe(op, t_num, item) :
+    if (op == 'read') :
+        return f"[READ]   | T{t_num} on {item} from DB"
+    return f"[WRITE]  | T{t_num} on {item} to DB"
+
+def count_operations(operations) :
+    '''
+    Menghitung jumlah operasi read dan write setiap transaksi pada schedule.
+    Hasilnya dipakai sebagai lock_points varian BASIC dan STRICT, karena lock point baru diketahui
+    jika seluruh operasi transaksi sudah terlihat, sehingga schedule harus dibaca dua kali
+    Params :
+    - operations : iterable ScheduleOp, contoh FileHandler.operations(ScheduleParser())
+    '''
+    counts = Counter()
+    for op in operations :
+        if (op.kind == READ or op.kind == WRITE) :
+            counts[op.t_num] += 1
+    return dict(counts)
+
+def format_event(event, fields) :
+    '''
+    Mengubah event TwoPL menjadi teks berwarna untuk ConsoleSink
+    '''
+    if (event == 'read' or event == 'write') :
+        text = _describe(event, fields['t_num'], fields['item'])
+        if (fields['queued']) :
+            return '\033[91m' + text + " | Inserted into queue"
+        return '\033[92m' + text
+    if (event == 'abort') :
+        if (fields['reason'] == 'closed') :
+            return '\033[93m' + f"[ABORT]  | T{fields['victim']} rolled back, its client is gone"
+        text = _describe(fields['op'], fields['t_num'], fields['item'])
+        if (fields['reason'] == 'deadlock') :
+            return ('\033[93m' + text + f" | Deadlock detected : {fields['cycle']}\n"
+                    + '\033[93m' + f"[ABORT]  | T{fields['victim']} rolled back")
+        return ('\033[93m' + text + f" | Lock held by {fields['reason']} transaction\n"
+                + '\033[93m' + f"[ABORT]  | T{fields['victim']} rolled back")
+    if (event == 'unlock') :
+        return '\033[94m' + f"[UNLOCK] | T{fields['t_num']} reached its lock point, unlocks {', '.join(fields['items'])}"
+    if (event == 'commit') :
+        return '\033[92m' + f"[COMMIT] | T{fields['t_num']}"
+    if (event == 'locked') :
+        return '\033[91m' + f"[LOCKED] | T{fields['t_num']} is waiting for lock"
+    if (event == 'state') :
+        lines = ['\033[0m' + f"[INFO]   | Current queue : {fields['queue']}", '\033[0m' + "[INFO]   | Current lock table :"]
+        for (name, holders) in fields['locks'] :
+            lines.append(f"[LOCK]   | {name} : " + "".join(lockType+f"L({lockNum}) " for (lockType, lockNum) in holders))
+        return "\n".join(lines) + "\n"
+    if (event == 'stalled') :
+        return '\033[94m' + f"[INFO]   | Queue not empty, transactions left waiting : {fields['queue']}"
+    if (event == 'done') :
+        return '\033[96m' + f"[FINAL]  | Final result : {fields['result']}\n" + '\033[0m'
+    return None
+
+class TwoPL(ConcurrencyControl) :
+    name = PROTOCOL_2PL
+
+    def __init__(self, policy = WOUND_WAIT, items = None, record_history = True, sink = None, victim = VICTIM_OPS,
+                 variant = RIGOROUS, lock_points = None) -> None:
+        '''
+        Params :
+        - policy : strategi penanganan deadlock, WOUND_WAIT atau WAIT_DIE untuk mencegah,
+          DETECT untuk membiarkan transaksi menunggu dan mendeteksi siklus pada waits-for graph
+        - items : ItemTable tempat nama item di-intern, dibuat baru jika tidak diberikan
+        - record_history : simpan urutan eksekusi untuk final_result, matikan agar memori
+          hanya sebanding dengan jumlah transaksi aktif saat memproses trace besar
+        - sink : EventSink penerima event simulasi, default ConsoleSink dengan format_event
+        - victim : biaya pemilihan korban pada mode DETECT, VICTIM_OPS (operasi yang sudah dieksekusi paling sedikit),
+          VICTIM_LOCKS (lock yang dipegang paling sedikit) atau VICTIM_YOUNGEST (transaksi termuda)
+        - variant : varian 2PL, BASIC, STRICT atau RIGOROUS (default, semua lock dilepas saat commit)
+        - lock_points : nomor transaksi -> jumlah operasi read dan write-nya, lihat count_operations.
+          Dibutuhkan BASIC dan STRICT, transaksi yang tidak ada di dalamnya memegang lock sampai commit
+        '''
+        if (policy not in POLICIES) :
+            raise Exception(f"Unknown deadlock policy : {policy}")
+        if (victim not in VICTIMS) :
+            raise Exception(f"Unknown victim cost : {victim}")
+        if (variant not in VARIANTS) :
+            raise Exception(f"Unknown 2PL variant : {variant}")
+        self.victim = victim
+        self.variant = variant
+        self.lock_points = lock_points if lock_points is not None else {}
+        # Lama lock dipegang dan lama transaksi menunggu lock, dalam jumlah operasi yang masuk
+        self.hold_time = Histogram()
+        self.wait_time = Histogram()
+        super().__init__(sink if sink is not None else ConsoleSink(format_event), items)
+        self.policy = policy
+        self.record_history = record_history
+        # Hasil schedule terakhir yang selesai, tetap tersedia setelah finish() me-reset state
+        self.final_result = []
+        self._reset()
+
+    def _reset(self) :
+        self.lock_list = LockManager()
+        # Timestamp transaksi berdasarkan urutan kedatangan, nomor transaksi -> urutan
+        self.timestamp = {}
+        self.clock = 0
+        # Operasi yang belum dieksekusi milik transaksi yang sedang menunggu, nomor transaksi -> deque operasi
+        self.pending = {}
+        # Antrean FIFO per item berisi transaksi yang menunggu lock item tersebut, disimpan sebagai linked list :
+        # waiters berisi item -> [kepala, ekor], ahead dan behind berisi nomor transaksi -> transaksi di depan dan di belakangnya
+        self.waiters = {}
+        self.ahead = {}
+        self.behind = {}
+        self.waiting_on = {}
+        # Jenis operasi (READ atau WRITE) yang ditunggu transaksi pada item waiting_on
+        self.wait_kind = {}
+        # Waktu transaksi mulai menunggu
+        self.wait_since = {}
+        # Transaksi yang di-rollback dan menunggu item untuk dijalankan ulang. Transaksi ini tidak memegang lock
+        # sehingga tidak ikut antrean lock : item -> deque nomor transaksi, dan nomor transaksi -> (item, jenis operasi)
+        self.retries = {}
+        self.retrying = {}
+        # Transaksi yang sudah melewati lock point dan tidak boleh mengambil lock lagi, nomor transaksi -> urutan lock point
+        self.shrinking = {}
+        self.lock_order = 0
+        # Item yang baru saja di-unlock dan antreannya perlu dibangunkan
+        self.released = deque()
+        # Operasi yang sudah dieksekusi pada percobaan transaksi saat ini, untuk rollback
+        self.executed = {}
+        # Penanda percobaan transaksi yang masih berlaku, dimatikan saat rollback
+        self.live = {}
+        self.history = []
+
+    def _rollback(self,num,item,op,wake=False,restart=True) :
+        '''
+        Melakukan rollback pada transaksi bernomor num.
+        Operasi yang sudah dieksekusi dikembalikan ke depan antrean operasi transaksi tersebut.
+        Transaksi yang sedang menunggu keluar dari antrean lock-nya dan menunggu item yang sama, selain itu transaksi
+        menunggu item untuk operasi op. Keduanya tanpa ikut antrean lock, sampai item tersebut bebas untuk dijalankan ulang.
+        Item tidak ikut dibangunkan kecuali wake, karena pada wound-wait lock-nya langsung dipegang transaksi yang lebih tua.
+        Jika tidak restart, transaksi dibuang beserta operasinya yang tertunda dan tidak dijalankan ulang
+        '''
+        self._release_locks(num, None if wake else item)
+        self.counts['aborts'] += 1
+        token = self.live.pop(num, None)
+        if (token is not None) :
+            token[0] = False
+        self.shrinking.pop(num, None)
+        if (num in self.waiting_on) :
+            (item, op) = self._unwait(num)
+            # Transaksi di belakangnya mungkin sudah bisa mengambil lock, antrean item ikut dibangunkan
+            self.released.append(item)
+        if (not restart) :
+            self.pending.pop(num, None)
+            self.executed.pop(num, None)
+            self.timestamp.pop(num, None)
+            self.wait_since.pop(num, None)
+            if (num in self.retrying) :
+                item = self.retrying.pop(num)[0]
+                retryQ = self.retries[item]
+                retryQ.remove(num)
+                if (not retryQ) :
+                    self.retries.pop(item, None)
+            return
+        # Transaksi yang di-rollback akan dijalankan ulang dari antreannya
+        self.counts['restarts'] += 1
+        pendingOps = self.pending.setdefault(num, deque())
+        pendingOps.extendleft(reversed(self.executed.pop(num, [])))
+        self._park(num, item, op)
+
+    def _blockers(self, op, num, item) :
+        '''
+        Transaksi yang harus ditunggu num sebelum mendapat lock item untuk operasi op : pemegang lock yang bertabrakan,
+        ditambah ekor antrean item karena hanya operasi yang sudah dicakup lock milik num yang boleh menyalip antrean
+        '''
+        blockers = self.lock_list.conflicts(op, num, item)
+        ends = self.waiters.get(item)
+        if (ends is not None and not self.lock_list.covers(op, num, item)) :
+            blockers.append(ends[1])
+        return blockers
+
+    def _resolve_conflict(self, op, num, item, blockers) :
+        '''
+        Mode WAIT_DIE : transaksi num menunggu jika lebih tua dari semua transaksi blockers yang harus ditunggunya,
+        selain itu num di-rollback dan menunggu item dijalankan ulang. Dengan begitu setiap transaksi hanya menunggu
+        transaksi yang lebih muda. Mengembalikan kode yang sama dengan _execute : 1 jika num menunggu, dan 3 jika num di-rollback
+        '''
+        if (all(self.timestamp[num] < self.timestamp[lockNum] for lockNum in blockers)) :
+            return 1
+        self.sink.emit('abort', op=_EVENTS[op], t_num=num, item=self.items.name(item), victim=num, reason='older')
+        # Shared lock num pada item ikut dilepas, antrean item dibangunkan karena tidak ada yang langsung mengambilnya
+        self._rollback(num, item, op, wake=True)
+        return 3
+
+    def _waits_for(self, num) :
+        '''
+        Edge waits-for transaksi num : pemegang lock yang bertabrakan dengan operasi yang ditunggunya.
+        Transaksi di belakang kepala antrean menunggu seluruh antrean di depannya, yang hanya bisa keluar dari antrean
+        lewat pemegang lock item, sehingga edge-nya diringkas menjadi kepala antrean dan semua pemegang lock item.
+        Ringkasan ini membuat DFS tidak menelusuri antrean satu per satu, paling buruk menemukan siklus yang sebenarnya
+        belum terbentuk. Tabel lock dan linked list antrean diperbarui setiap lock diberikan, dilepas, atau transaksi
+        masuk dan keluar antrean, sehingga edge tidak pernah basi
+        '''
+        item = self.waiting_on.get(num)
+        if (item is None) :
+            return []
+        if (num not in self.ahead) :
+            return self.lock_list.conflicts(self.wait_kind[num], num, item)
+        edges = [lockNum for (lockType, lockNum) in self.lock_list.holders(item) if lockNum != num]
+        edges.append(self.waiters[item][0])
+        return edges
+
+    def _find_cycle(self, num, holders) :
+        '''
+        Mencari siklus pada waits-for graph yang melewati transaksi num, yang akan menunggu holders, dengan DFS iteratif.
+        Mengembalikan daftar transaksi pada siklus dimulai dari num, atau None jika tidak ada siklus
+        '''
+        path = [num]
+        work = [iter(holders)]
+        visited = {num}
+        while work :
+            nextNum = next(work[-1], None)
+            if (nextNum is None) :
+                work.pop()
+                path.pop()
+            elif (nextNum == num) :
+                return path
+            elif (nextNum not in visited) :
+                visited.add(nextNum)
+                path.append(nextNum)
+                work.append(iter(self._waits_for(nextNum)))
+        return None
+
+    def _cost(self, num) :
+        '''
+        Biaya me-rollback transaksi num menurut self.victim, seri dipecahkan dengan memilih transaksi termuda
+        '''
+        if (self.victim == VICTIM_OPS) :
+            return (len(self.executed.get(num, ())), -self.timestamp[num])
+        if (self.victim == VICTIM_LOCKS) :
+            return (len(self.lock_list.held.get(num, ())), -self.timestamp[num])
+        return (-self.timestamp[num],)
+
+    def _detect(self, op, num, item, blockers) :
+        '''
+        Mode DETECT : transaksi num menunggu semua transaksi blockers.
+        Siklus hanya dicari saat edge baru ini ditambahkan, setiap siklus diputus dengan me-rollback
+        transaksi termurah di dalamnya. Mengembalikan 0 jika lock bisa langsung diambil, 1 jika num menunggu
+        dan 3 jika num sendiri di-rollback
+        '''
+        cycle = self._find_cycle(num, blockers)
+        while (cycle is not None) :
+            victim = min(cycle, key=self._cost)
+            self.sink.emit('abort', op=_EVENTS[op], t_num=num, item=self.items.name(item), victim=victim,
+                           reason='deadlock', cycle=cycle)
+            if (victim == num) :
+                self._rollback(num, item, op, wake=True)
+                return 3
+            # Korban sedang menunggu di antrean lain, lock-nya dilepas dan antreannya dibangunkan.
+            # Korban keluar dari antreannya sehingga edge menuju korban ikut terputus
+            self._rollback(victim, item, op, wake=True)
+            blockers = self._blockers(op, num, item)
+            if (not blockers) :
+                return 0
+            cycle = self._find_cycle(num, blockers)
+        return 1
+
+    def _wound(self, op, num, item) :
+        '''
+        Mode WOUND_WAIT : transaksi num me-rollback semua pemegang lock item yang bertabrakan dan lebih muda,
+        begitu juga transaksi lebih muda di ekor antrean item yang akan ditunggunya.
+        Transaksi tidak menyalip antrean, sehingga num menunggu jika masih ada pemegang yang lebih tua
+        atau antrean item tidak kosong. Dengan begitu setiap transaksi hanya menunggu transaksi yang lebih tua.
+        Mengembalikan 0 jika lock bisa langsung diambil dan 1 jika num menunggu
+        '''
+        older = False
+        for lockNum in self.lock_list.conflicts(op, num, item) :
+            if (self.timestamp[num] < self.timestamp[lockNum]) :
+                self.sink.emit('abort', op=_EVENTS[op], t_num=num, item=self.items.name(item), victim=lockNum, reason='younger')
+                self._rollback(lockNum, item, op)
+            else :
+                older = True
+        ends = self.waiters.get(item)
+        while (ends is not None and self.timestamp[num] < self.timestamp[ends[1]]) :
+            self.sink.emit('abort', op=_EVENTS[op], t_num=num, item=self.items.name(item), victim=ends[1], reason='younger')
+            self._rollback(ends[1], item, op)
+            ends = self.waiters.get(item)
+        return 1 if (older or ends is not None) else 0
+
+    def _acquire_lock(self, op, num, item) :
+        '''
+        Mencoba mengambil lock untuk operasi op. Mengembalikan 0 jika berhasil, 1 jika harus menunggu, 3 jika di-rollback
+        '''
+        blockers = self._blockers(op, num, item)
+        if (blockers) :
+            if (self.policy == WOUND_WAIT) :
+                code = self._wound(op, num, item)
+            elif (self.policy == WAIT_DIE) :
+                code = self._resolve_conflict(op, num, item, blockers)
+            else :
+                code = self._detect(op, num, item, blockers)
+            if (code != 0) :
+                return code
+        if op == READ : # Operasi read
+            self.lock_list.grant_shared(num, item, self.counts['ops'])
+        else : # Operasi write, jika sudah punya shared lock, grant_exclusive sekaligus melakukan upgrade
+            self.lock_list.grant_exclusive(num, item, self.counts['ops'])
+        return 0
+
+    def _release_locks(self, num, keep=None, shared_only=False) :
+        '''
+        Melepas semua lock transaksi num, atau hanya shared lock-nya jika shared_only,
+        dan menandai item tersebut (kecuali keep) agar antreannya dibangunkan
+        '''
+        items = self.lock_list.release_shared(num) if shared_only else self.lock_list.release_all(num)
+        self.released.extend(item for item in items if item != keep)
+        now = self.counts['ops']
+        for since in items.values() :
+            self.hold_time.add(now - since)
+        return items
+
+    def _shrink(self, num) :
+        '''
+        Transaksi num melewati lock point dan masuk fase shrinking : BASIC melepas semua lock-nya, STRICT hanya shared lock
+        '''
+        self.shrinking[num] = self.lock_order
+        self.lock_order += 1
+        items = self._release_locks(num, shared_only=self.variant == STRICT)
+        if (items) :
+            self.sink.emit('unlock', t_num=num, items=[self.items.name(item) for item in items])
+
+    def _wait(self, num, item, op) :
+        '''
+        Memasukkan transaksi num yang menunggu lock untuk operasi op ke ekor antrean item.
+        Upgrade shared lock juga mengantre di ekor, sehingga edge waits-for baru hanya milik num dan selalu diperiksa
+        '''
+        ends = self.waiters.get(item)
+        if (ends is None) :
+            self.waiters[item] = [num, num]
+        else :
+            self.behind[ends[1]] = num
+            self.ahead[num] = ends[1]
+            ends[1] = num
+        self.waiting_on[num] = item
+        self.wait_kind[num] = op
+        self.wait_since.setdefault(num, self.counts['ops'])
+
+    def _unwait(self, num) :
+        '''
+        Mengeluarkan transaksi num dari antrean item yang ditunggunya, di posisi mana pun.
+        Mengembalikan tuple (<item>, <jenis operasi yang ditunggu>)
+        '''
+        item = self.waiting_on.pop(num)
+        op = self.wait_kind.pop(num)
+        ahead = self.ahead.pop(num, None)
+        behind = self.behind.pop(num, None)
+        ends = self.waiters[item]
+        if (ahead is None) :
+            ends[0] = behind
+        elif (behind is None) :
+            del self.behind[ahead]
+        else :
+            self.behind[ahead] = behind
+        if (behind is None) :
+            ends[1] = ahead
+        elif (ahead is None) :
+            del self.ahead[behind]
+        else :
+            self.ahead[behind] = ahead
+        if (ends[0] is None) :
+            del self.waiters[item]
+        return (item, op)
+
+    def _park(self, num, item, op) :
+        '''
+        Transaksi num yang di-rollback menunggu item sampai tidak ada lock yang bertabrakan dengan operasi op
+        dan antrean item kosong, lalu dijalankan ulang dari awal
+        '''
+        self.retries.setdefault(item, deque()).append(num)
+        self.retrying[num] = (item, op)
+        self.wait_since.setdefault(num, self.counts['ops'])
+
+    def _queue(self) :
+        '''
+        Mengembalikan semua operasi yang sedang menunggu, dikelompokkan per transaksi
+        '''
+        return [format_op(comm, self.items) for pendingOps in self.pending.values() for comm in pendingOps]
+
+    def _emit_state(self) :
+        '''
+        Mengirim isi queue dan tabel lock, hanya untuk sink verbose karena biayanya sebanding jumlah item
+        '''
+        if (self.sink.verbose) :
+            locks = [(self.items.name(item), self.lock_list.holders(item)) for item in self.lock_list]
+            self.sink.emit('state', queue=self._queue(), locks=locks)
+
+    def _execute(self, trans) :
+        '''
+        Mengecek eksekusi operasi yang diberikan.
+        Mengembalikan tuple dengan format (<kode hasil>, <nomor transaksi yang dieksekusi>).
+        Berikut kode hasil yang digunakan dan artinya :
+        - 0 = berhasil tanpa masalah
+        - 1 = operasi masuk ke queue
+        - 2 = terjadi unlock
+        - 3 = transaksi di-rollback (unlock) dan operasi masuk ke queue
+        '''
+        op = trans.kind
+        num = trans.t_num
+        if (op == READ or op == WRITE) :
+            if (num in self.shrinking) :
+                raise Exception(f"T{num} needs a lock after its lock point, lock_points does not match the schedule : {trans}")
+            item = trans.item
+            lockCode = self._acquire_lock(op, num, item)
+            if (op == WRITE) :
+                self.sink.emit('write', t_num=num, item=self.items.name(item), queued=lockCode != 0, value=trans.value)
+            else :
+                self.sink.emit('read', t_num=num, item=self.items.name(item), queued=lockCode != 0)
+            if (lockCode != 0) :
+                return (lockCode,num)
+        elif op == COMMIT : # Operasi commit
+            # Buka semua lock yang dipegang transaksi yang dicommit
+            self._release_locks(num)
+            self._record(trans)
+            # Transaksi selesai, buang state miliknya agar memori tidak tumbuh sepanjang trace
+            self.executed.pop(num, None)
+            self.live.pop(num, None)
+            self.timestamp.pop(num, None)
+            self.counts['commits'] += 1
+            if (self.variant == RIGOROUS) :
+                self.sink.emit('commit', t_num=num)
+            else :
+                # Urutan serial ekuivalen BASIC dan STRICT adalah urutan lock point, bukan urutan commit.
+                # Transaksi tanpa lock point di lock_points mencapai lock point-nya saat commit
+                lockPoint = self.shrinking.pop(num, None)
+                if (lockPoint is None) :
+                    lockPoint = self.lock_order
+                    self.lock_order += 1
+                self.sink.emit('commit', t_num=num, timestamp=lockPoint)
+            return (2, num)
+        else :
+            raise Exception(f"Command not valid : {trans}")
+        executedOps = self.executed.setdefault(num, [])
+        executedOps.append(trans)
+        self._record(trans)
+        if (self.variant != RIGOROUS and len(executedOps) == self.lock_points.get(num)) :
+            self._shrink(num)
+        return (0,num)
+
+    def _record(self, trans) :
+        '''
+        Mencatat operasi yang berhasil dieksekusi ke riwayat untuk final_result
+        '''
+        if (self.record_history) :
+            self.history.append((self.live.setdefault(trans.t_num, [True]), format_op(trans, self.items)))
+
+    def _resume(self, num) :
+        '''
+        Mengeksekusi operasi yang tertunda milik transaksi num secara berurutan sampai habis atau tertahan lock.
+        Mengembalikan tuple (<kode hasil>, <item yang ditunggu>), item bernilai None jika semua operasi selesai.
+        Untuk kode 1 yang dikembalikan adalah operasi yang tertahan
+        '''
+        pendingOps = self.pending[num]
+        while pendingOps :
+            trans = pendingOps[0]
+            code = self._execute(trans)[0]
+            if (code == 3) :
+                # Transaksi sudah di-rollback dan menunggu item untuk dijalankan ulang
+                return (code, self.retrying[num][0])
+            if (code == 1) :
+                return (code, trans)
+            pendingOps.popleft()
+        del self.pending[num]
+        return (0, None)
+
+    def _wake(self, num) :
+        '''
+        Menjalankan kembali operasi tertunda transaksi num yang selesai menunggu
+        '''
+        self.wait_time.add(self.counts['ops'] - self.wait_since.pop(num))
+        code, blocked = self._resume(num)
+        if (code == 1) :
+            self._wait(num, blocked.item, blocked.kind)
+
+    def _wake_queue(self, item) :
+        '''
+        Memberikan lock item ke transaksi yang menunggu secara FIFO dari kepala antrean, lalu menjalankan ulang
+        transaksi yang di-rollback selama antrean item kosong. Pembangunan berhenti di transaksi pertama yang masih
+        bertabrakan dan sisa antrean tidak disentuh, sehingga biayanya sebanding dengan jumlah transaksi yang dibangunkan
+        '''
+        # Semua lock diberikan sebelum transaksinya dijalankan ulang, agar transaksi yang dijalankan lebih dulu
+        # mengantre di belakang kepala antrean yang bertabrakan dan bukan di belakang transaksi yang sudah boleh jalan
+        granted = []
+        ends = self.waiters.get(item)
+        while (ends is not None and not self.lock_list.conflicts(self.wait_kind[ends[0]], ends[0], item)) :
+            num = ends[0]
+            (item, op) = self._unwait(num)
+            if (op == READ) :
+                self.lock_list.grant_shared(num, item, self.counts['ops'])
+            else :
+                self.lock_list.grant_exclusive(num, item, self.counts['ops'])
+            granted.append(num)
+            ends = self.waiters.get(item)
+        for num in granted :
+            # Transaksi yang di-rollback oleh transaksi sebelumnya di granted sudah menunggu untuk dijalankan ulang
+            if (num in self.pending and num not in self.waiting_on and num not in self.retrying) :
+                self._wake(num)
+        retryQ = self.retries.get(item)
+        while (retryQ and item not in self.waiters) :
+            num = retryQ[0]
+            if (self.lock_list.conflicts(self.retrying[num][1], num, item)) :
+                break
+            retryQ.popleft()
+            del self.retrying[num]
+            self._wake(num)
+        if (not retryQ) :
+            self.retries.pop(item, None)
+
+    def _wake_released(self) :
+        '''
+        Membangunkan transaksi yang menunggu item yang baru saja di-unlock, hanya antrean item tersebut yang diperiksa
+        '''
+        while self.released :
+            self._wake_queue(self.released.popleft())
+
+    def submit(self, comm) :
+        '''
+        Memproses satu operasi berikutnya dari schedule.
+        Mengembalikan True jika operasi langsung dieksekusi, False jika masuk antrean atau transaksinya di-rollback
+        Params :
+        - comm : ScheduleOp hasil ScheduleParser dengan ItemTable self.items, atau string command seperti R2(A)
+        '''
+        comm = self.parse(comm)
+        self.counts['ops'] += 1
+        num = comm.t_num
+        if (not(num in self.timestamp)) :
+            self.timestamp[num] = self.clock
+            self.clock += 1
+        if (comm.item is not None) :
+            self.lock_list.add_item(comm.item)
+
+        # Periksa apakah transaksi dengan nomor tersebut sedang menunggu, jika iya, masukkan ke antreannya
+        if (num in self.pending) :
+            self.sink.emit('locked', t_num=num)
+            self.pending[num].append(comm)
+            success = False
+        else :
+            self.pending[num] = deque([comm])
+            code, blocked = self._resume(num)
+            if (code == 1) :
+                self._wait(num, blocked.item, blocked.kind)
+            success = code == 0
+        # Jika ada lock yang dibuka, bangunkan antrean item tersebut
+        self._wake_released()
+        self._emit_state()
+        return success
+
+    def abort(self, t_num) :
+        '''
+        Me-rollback transaksi t_num tanpa menjalankannya ulang, misalnya saat client-nya pergi.
+        Lock-nya dilepas dan antrean item tersebut dibangunkan, operasinya yang tertunda dibuang
+        '''
+        if (t_num not in self.timestamp) :
+            return
+        self.sink.emit('abort', t_num=t_num, victim=t_num, reason='closed')
+        self._rollback(t_num, None, None, wake=True, restart=False)
+        self._wake_released()
+        self._emit_state()
+
+    def stats(self) :
+        '''
+        Counter schedule ditambah varian 2PL serta histogram lama lock dipegang (lock_hold)
+        dan lama transaksi menunggu lock (lock_wait), dalam jumlah operasi yang masuk
+        '''
+        stats = super().stats()
+        stats.update(variant=self.variant, lock_hold=self.hold_time.summary(), lock_wait=self.wait_time.summary())
+        return stats
+
+    def waiting(self) :
+        '''
+        Jumlah transaksi yang sedang menunggu lock, termasuk transaksi yang di-rollback dan menunggu dijalankan ulang
+        '''
+        return len(self.waiting_on) + len(self.retrying)
+
+    def blocked(self, t_num) :
+        '''
+        Apakah transaksi t_num masih punya operasi yang tertunda, baik karena menunggu lock maupun setelah di-rollback
+        '''
+        return t_num in self.pending
+
+    def finish(self) :
+        '''
+        Mengakhiri schedule, transaksi yang masih menunggu dilaporkan lalu final_result dihitung dan state di-reset.
+        final_result tidak ikut di-reset sehingga bisa dibaca setelah run(), misalnya untuk Serializability.check
+        '''
+        if (len(self.pending) > 0) :
+            self.sink.emit('stalled', queue=self._queue())
+        self.final_result = [result for (token, result) in self.history if token[0]]
+        self.sink.emit('done', result=self.final_result)
+        # Reset variables
+        self._reset()
+
+    def simulate(self, transaction) :
+        '''
+        Lakukan simulasi two phase locking menggunakan transaksi yang diberikan.
+        Penanganan deadlock menggunakan strategi wound-wait (default), wait-die, atau deteksi siklus sesuai self.policy
+        Params :
+        - transaction : iterable ScheduleOp hasil ScheduleParser dengan ItemTable self.items, diproses satu per satu
+          sehingga bisa berupa generator dari FileHandler, atau array of string berisi daftar command, nomor transaksi, beserta item yang diperlukan. Contoh : [R2(A),W1(B),C1,C2]
+        '''
+        return self.run(transaction)
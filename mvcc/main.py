@@ -1,20 +1,12 @@
+import os
 import sys
-from Mvcc import MVCC
-from FileHandler import FileHandler
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 
-def main():
-    if len(sys.argv) != 2:
-        raise Exception('Usage : python3 main.py <filename>')
-
-    file_handler = FileHandler(sys.argv[1])
-    mvcc = MVCC(file_handler)
-    mvcc.run()
+from dbcc.__main__ import main
 
+# Kept so python main.py test/test1.txt still works, same as python -m dbcc --protocol mvcc
 if __name__ == '__main__':
     try:
-        print("--- Simulating MVCC on DB ---")
-        print(f"\nResult from MVCC Timestamp Ordering Protocol: ")
-        main()
+        main(['--protocol', 'mvcc'] + sys.argv[1:])
     except Exception as e:
         print(e)
-
@@ -1,22 +1,12 @@
+import os
 import sys
-from Occ import OCC
-from FileHandler import FileHandler
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 
-def main():
-    if len(sys.argv) != 2:
-        raise Exception('Usage : python3 main.py <filename>')
+from dbcc.__main__ import main
 
-    file_handler = FileHandler(sys.argv[1])
-    occ = OCC(file_handler)
-    occ.run()
-
-# Main program
-if __name__ == "__main__":
+# Kept so python main.py test/test1.txt still works, same as python -m dbcc --protocol occ
+if __name__ == '__main__':
     try:
-        print("--- Simulating OCC on DB ---")
-        print(f"\nResult from OCC Protocol: ")
-        main()
+        main(['--protocol', 'occ'] + sys.argv[1:])
     except Exception as e:
         print(e)
-        
-        
\ No newline at end of file
@@ -0,0 +1,57 @@
+import pytest
+
+from dbcc.Engine import make_engine
+from dbcc.Events import EventSink
+from dbcc.twopl.twoPL import POLICIES, WAIT_DIE
+
+
+class ResultSink(EventSink):
+    '''
+    Class ResultSink, keeps the final result of a 2PL schedule
+    '''
+    def emit(self, event: str, **fields):
+        if event == 'done':
+            self.result = fields['result']
+
+
+@pytest.mark.parametrize('policy', POLICIES)
+def test_twopl_abort_releases_locks(policy):
+    sink = ResultSink()
+    engine = make_engine('2pl', sink, policy=policy)
+    engine.submit('W1(X)')
+    engine.submit('R2(X)')
+    assert engine.blocked(2)
+    engine.abort(1)
+    assert not engine.blocked(2)
+    engine.submit('C2')
+    stats = engine.stats()
+    engine.finish()
+    assert sink.result == ['R2(X)', 'C2']
+    # Under wait-die the younger T2 died on its own before T1 was rolled back
+    restarts = 1 if policy == WAIT_DIE else 0
+    assert (stats['commits'], stats['aborts'], stats['restarts'], stats['waiting']) == (1, 1 + restarts, restarts, 0)
+
+
+def test_occ_abort_drops_workspace():
+    engine = make_engine('occ', EventSink())
+    engine.submit('W1(X)')
+    engine.submit('R2(X)')
+    engine.abort(1)
+    assert 1 not in engine.workspaces
+    engine.submit('C2')
+    engine.finish()
+    assert engine.store.get('X') is None
+    assert (engine.stats()['commits'], engine.stats()['aborts']) == (1, 1)
+
+
+def test_mvcc_abort_cascades():
+    engine = make_engine('mvcc', EventSink())
+    engine.submit('W1(X)')
+    engine.submit('R2(X)')
+    engine.abort(1)
+    # T2 read the version of T1, it is re-run and now reads the initial version
+    assert [version.writer for version in engine.version_controller.get('X')] == [None]
+    engine.submit('C2')
+    engine.finish()
+    stats = engine.stats()
+    assert (stats['commits'], stats['aborts'], stats['restarts']) == (1, 2, 1)
@@ -0,0 +1,25 @@
+import dbcc.Batch
+from dbcc.Batch import run_file
+from dbcc.twopl.twoPL import RIGOROUS, WOUND_WAIT
+
+
+def test_engine_error_is_reported_per_protocol(tmp_path, monkeypatch):
+    path = tmp_path / 'schedule.txt'
+    path.write_text("R1(X);W2(X);C1;C2\n")
+    make_engine = dbcc.Batch.make_engine
+
+    def failing(protocol, *args, **kwargs):
+        if protocol == 'occ':
+            raise RuntimeError("engine broke")
+        return make_engine(protocol, *args, **kwargs)
+
+    monkeypatch.setattr(dbcc.Batch, 'make_engine', failing)
+    results = run_file((str(path), ['2pl', 'occ', 'mvcc'], WOUND_WAIT, RIGOROUS))
+    assert [result['protocol'] for result in results] == ['2pl', 'occ', 'mvcc']
+    assert results[1]['error'] == "RuntimeError : engine broke"
+    assert 'error' not in results[0] and results[2]['commits'] == 2
+
+
+def test_missing_file_is_reported(tmp_path):
+    results = run_file((str(tmp_path / 'missing.txt'), ['mvcc'], WOUND_WAIT, RIGOROUS))
+    assert 'No such file' in results[0]['error']
@@ -0,0 +1,11 @@
+from dbcc.FileHandler import FileHandler
+from dbcc.Parser import ScheduleParser, format_op
+
+
+def test_operations_outlive_the_handler(tmp_path):
+    path = tmp_path / 'schedule.txt'
+    path.write_text("R1(X);W2(X)\nC1;C2\n")
+    parser = ScheduleParser()
+    # No reference to the handler is kept, the generator owns the file
+    operations = FileHandler(str(path)).operations(parser)
+    assert [format_op(op, parser.items) for op in operations] == ['R1(X)', 'W2(X)', 'C1', 'C2']
@@ -0,0 +1,68 @@
+from dbcc.twopl.LockManager import LockManager
+
+
+def test_shared_locks_are_compatible():
+    locks = LockManager()
+    locks.grant_shared(1, 'X')
+    locks.grant_shared(2, 'X')
+    assert locks.holders('X') == [('S', 1), ('S', 2)]
+    assert locks.conflicts('R', 3, 'X') == []
+    assert locks.covers('R', 1, 'X') and not locks.covers('R', 3, 'X')
+    # A write conflicts with every other reader, not with its own shared lock
+    assert locks.conflicts('W', 3, 'X') == [1, 2]
+    assert locks.conflicts('W', 1, 'X') == [2]
+    assert not locks.covers('W', 1, 'X')
+
+
+def test_exclusive_lock_conflicts_with_everyone_else():
+    locks = LockManager()
+    locks.grant_exclusive(1, 'X')
+    assert locks.holders('X') == [('X', 1)]
+    assert locks.conflicts('R', 2, 'X') == [1]
+    assert locks.conflicts('W', 2, 'X') == [1]
+    assert (locks.conflicts('R', 1, 'X'), locks.conflicts('W', 1, 'X')) == ([], [])
+    assert locks.covers('R', 1, 'X') and locks.covers('W', 1, 'X')
+    # Reading under its own exclusive lock adds no shared lock
+    locks.grant_shared(1, 'X')
+    assert locks.holders('X') == [('X', 1)]
+    assert locks.conflicts('R', 2, 'Y') == []
+
+
+def test_upgrade_keeps_the_time_of_the_shared_lock():
+    locks = LockManager()
+    locks.grant_shared(1, 'X', time=3)
+    locks.grant_shared(2, 'X', time=4)
+    locks.grant_exclusive(1, 'X', time=9)
+    assert locks.holders('X') == [('S', 2), ('X', 1)]
+    assert locks.held[1] == {'X': 3}
+    assert locks.release_shared(1) == {}
+    assert locks.release_all(1) == {'X': 3}
+    assert locks.holders('X') == [('S', 2)]
+
+
+def test_release_all_clears_the_reverse_index():
+    locks = LockManager()
+    locks.grant_shared(1, 'X', time=1)
+    locks.grant_exclusive(1, 'Y', time=2)
+    locks.grant_shared(2, 'X', time=3)
+    assert locks.held == {1: {'X': 1, 'Y': 2}, 2: {'X': 3}}
+    assert locks.release_all(1) == {'X': 1, 'Y': 2}
+    assert locks.held == {2: {'X': 3}}
+    assert (locks.holders('X'), locks.holders('Y')) == ([('S', 2)], [])
+    assert locks.conflicts('W', 3, 'Y') == []
+    # Releasing again, or a transaction without locks, changes nothing
+    assert locks.release_all(1) == {}
+    assert locks.release_all(5) == {}
+    assert locks.held == {2: {'X': 3}}
+    assert list(locks) == ['X', 'Y']
+
+
+def test_release_shared_keeps_exclusive_locks():
+    locks = LockManager()
+    locks.grant_shared(1, 'X', time=1)
+    locks.grant_exclusive(1, 'Y', time=2)
+    assert locks.release_shared(1) == {'X': 1}
+    assert locks.held == {1: {'Y': 2}}
+    assert locks.holders('X') == []
+    assert locks.release_all(1) == {'Y': 2}
+    assert locks.held == {}
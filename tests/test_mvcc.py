@@ -0,0 +1,99 @@
+import random
+
+import pytest
+
+from dbcc.Events import EventSink
+from dbcc.mvcc import MVCC
+from dbcc.Parser import ItemTable
+from dbcc.Workload import Workload
+
+
+class RecordingSink(EventSink):
+    '''
+    Class RecordingSink, keeps every event as (event, fields)
+    '''
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event: str, **fields):
+        self.events.append((event, fields))
+
+
+def run(schedule: str):
+    sink = RecordingSink()
+    engine = MVCC(sink, vacuum_threshold=0)
+    stats = engine.run(schedule.split(';'))
+    return engine, sink, stats
+
+
+def test_new_transaction_does_not_reuse_a_restart_timestamp():
+    # T3 restarts with timestamp 6 before T6 shows up, T6 must not take 6 as well
+    engine, sink, stats = run("R5(X);W3(X);W6(X);C3;C5;C6")
+    timestamps = {t_num: trx.timestamp for (t_num, trx) in engine.transactions.items()}
+    assert len(set(timestamps.values())) == len(timestamps)
+    assert timestamps[6] != timestamps[3]
+    assert stats['commits'] == 3
+
+    # Both writes of X are kept as their own version
+    writers = [fields['t_num'] for (event, fields) in sink.events if event == 'write' and fields['success']]
+    assert writers == [3, 6]
+    versions = engine.version_controller.get('X')
+    assert [version.write_ts for version in versions] == [0, timestamps[3], timestamps[6]]
+
+
+def test_first_come_transactions_keep_their_number():
+    engine, _, stats = run("R5(X);R2(Y);R1(Y);C1;C2;C5")
+    assert {t_num: trx.timestamp for (t_num, trx) in engine.transactions.items()} == {5: 5, 2: 2, 1: 1}
+    assert stats['commits'] == 3
+
+
+def test_cascade_into_a_committed_transaction_counts_it_once():
+    # T2 is rolled back after T3, which read its version of X, committed, T3 commits again when re-run
+    engine, sink, stats = run("W2(X);R3(X);C3;R4(Y);W2(Y);C2;C4")
+    undone = [fields['t_num'] for (event, fields) in sink.events if event == 'abort' and fields['committed']]
+    assert undone == [3]
+    assert stats['commits'] == 3
+
+
+
+class VersionlessSink(RecordingSink):
+    '''
+    Class VersionlessSink, the events without the vacuum reports and the version lists that vacuuming shortens
+    '''
+    def emit(self, event: str, **fields):
+        if event != 'vacuum':
+            fields.pop('versions', None)
+            super().emit(event, **fields)
+
+
+def late_schedule(seed: int):
+    '''
+        Random schedule with its transactions renumbered at random, so low numbers show up late,
+        below the oldest active timestamp
+    '''
+    numbers = list(range(1, 13))
+    random.Random(seed).shuffle(numbers)
+    items = ItemTable()
+    workload = Workload(transactions=12, ops_per_transaction=4, read_ratio=0.5, items=5, skew=0.5, concurrency=4, seed=seed)
+    return ([op._replace(t_num=numbers[op.t_num - 1]) for op in workload.operations(items)], items)
+
+
+@pytest.mark.parametrize('seed', range(100))
+def test_vacuum_does_not_change_the_schedule(seed):
+    runs = []
+    for threshold in (0, 1):
+        (ops, items) = late_schedule(seed)
+        sink = VersionlessSink()
+        stats = MVCC(sink, vacuum_threshold=threshold, items=items).run(ops)
+        runs.append((sink.events, stats))
+    assert runs[0] == runs[1]
+
+
+def test_vacuum_reclaims_versions_of_late_schedules():
+    reclaimed = 0
+    for seed in range(20):
+        (ops, items) = late_schedule(seed)
+        engine = MVCC(EventSink(), vacuum_threshold=1, items=items)
+        engine.run(ops)
+        reclaimed += engine.version_controller.versions_reclaimed
+    assert reclaimed > 0
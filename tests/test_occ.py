@@ -0,0 +1,26 @@
+import math
+
+import pytest
+
+from dbcc.Events import EventSink
+from dbcc.occ import OCC
+from dbcc.Parser import ItemTable
+from dbcc.Workload import Workload
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_prune_keeps_exactly_the_overlapping_commits(seed):
+    items = ItemTable()
+    workload = Workload(transactions=40, ops_per_transaction=4, read_ratio=0.5, items=5, skew=0.8, concurrency=6, seed=seed)
+    engine = OCC(EventSink(), retry_limit=3, backoff=seed % 3, items=items)
+    for (index, op) in enumerate(workload.operations(items)):
+        engine.submit(op)
+        if index % 7 == 3 and op.t_num in engine.transactions:
+            engine.abort(op.t_num)
+        # Pruning keeps the commits that finished at or after the oldest start of an active transaction
+        low_water = min((trx.start for trx in engine.transactions.values()), default=math.inf)
+        expected = [trx for trx in engine.committed if trx.finish >= low_water]
+        engine.prune()
+        assert list(engine.committed) == expected
+        assert (engine.starts[0][0] if engine.starts else math.inf) == low_water
+    engine.finish()
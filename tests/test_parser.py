@@ -0,0 +1,27 @@
+import pytest
+
+from dbcc.Parser import ScheduleParseError, ScheduleParser
+from dbcc.Serializability import committed_transactions
+
+
+@pytest.mark.parametrize(('lines', 'line', 'text'), [
+    (["R1(X);", "W2(X);", "X3;", "C1"], 3, 'X3'),
+    (["R1(X);W2(Y);C3(Z)"], 1, 'C3(Z)'),
+    (["R1(X);", "", "   ", "W2;"], 4, 'W2'),
+    (["# T1 reads X", "R1(X); # then T2 writes it", "", "# bad commit below", "W2(X);", "C2(X)"], 6, 'C2(X)'),
+    (["R1(X);", "R1 (X) # spaces are fine", "R1(X Y)"], 3, 'R1(X Y)'),
+])
+def test_parse_error_reports_its_line(lines, line, text):
+    with pytest.raises(ScheduleParseError) as error:
+        list(ScheduleParser().parse(lines))
+    assert error.value.line == line
+    assert error.value.text == text
+    assert str(error.value).startswith(f"Line {line}: ")
+
+
+def test_parse_keeps_line_numbers_and_skips_comments():
+    lines = ["# header", "R10(Account42); W2(B) # two on one line", "", "C10;", "#C2", "C2"]
+    ops = list(ScheduleParser().parse(lines))
+    assert [(op.kind, op.t_num, op.line) for op in ops] == [('R', 10, 2), ('W', 2, 2), ('C', 10, 4), ('C', 2, 6)]
+    assert committed_transactions(lines) == {10, 2}
+    assert committed_transactions(["C1; # C3", "# C4"]) == {1}
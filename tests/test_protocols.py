@@ -0,0 +1,128 @@
+import pytest
+
+from dbcc.Events import EventSink
+from dbcc.mvcc import MVCC
+from dbcc.occ import OCC
+from dbcc.Parser import ItemTable
+from dbcc.Serializability import check
+from dbcc.twopl import TwoPL
+from dbcc.twopl.twoPL import POLICIES, RIGOROUS, VARIANTS, count_operations
+from dbcc.Workload import Workload
+
+SEEDS = range(40)
+TRANSACTIONS = 20
+
+
+def schedule(seed):
+    '''
+        Random schedule of a few hot items, with the item table it was interned in
+    '''
+    workload = Workload(transactions=TRANSACTIONS, ops_per_transaction=4, read_ratio=0.5, items=6,
+                        skew=0.8, concurrency=5, seed=seed)
+    items = ItemTable()
+    return (list(workload.operations(items)), items)
+
+
+class HistorySink(EventSink):
+    '''
+    Class HistorySink, the operations that took effect, without the ones of an aborted attempt
+    '''
+    def __init__(self):
+        self.history = []
+        # Per transaction, the flag of its current attempt, cleared when it is rolled back
+        self.attempts = {}
+
+    def attempt(self, t_num):
+        return self.attempts.setdefault(t_num, [True])
+
+    def emit(self, event: str, **fields):
+        t_num = fields.get('t_num')
+        if event == 'read':
+            self.history.append((self.attempt(t_num), f"R{t_num}({fields['item']})"))
+        elif event == 'write':
+            # OCC only reports a write when the workspace is installed
+            self.history.append((self.attempt(t_num), f"W{t_num}({fields['item']})"))
+        elif event == 'commit':
+            self.history.append((self.attempt(t_num), f"C{t_num}"))
+        elif event == 'abort':
+            self.attempts.pop(t_num, [True])[0] = False
+
+    def committed(self):
+        return [text for (attempt, text) in self.history if attempt[0]]
+
+
+class ResultSink(EventSink):
+    '''
+    Class ResultSink, keeps the final result of a 2PL schedule
+    '''
+    def emit(self, event: str, **fields):
+        if event == 'done':
+            self.result = fields['result']
+
+
+class TracedMVCC(MVCC):
+    '''
+    Class TracedMVCC, MVCC remembering the writer of the version each read saw
+    '''
+    def __init__(self, sink, items):
+        super().__init__(sink, vacuum_threshold=0, items=items)
+        self.reads = []
+
+    def process_read(self, op):
+        version = self.version_controller.visible(op.item, self.find_transaction(op.t_num).timestamp)
+        success = super().process_read(op)
+        if success:
+            self.reads.append((self.sink.attempt(op.t_num), op.t_num, op.item, version.writer))
+        return success
+
+
+@pytest.mark.parametrize('variant', VARIANTS)
+@pytest.mark.parametrize('policy', POLICIES)
+@pytest.mark.parametrize('seed', SEEDS)
+def test_twopl_is_conflict_serializable(seed, policy, variant):
+    (ops, items) = schedule(seed)
+    lock_points = count_operations(ops) if variant != RIGOROUS else None
+    sink = ResultSink()
+    engine = TwoPL(policy, items, sink=sink, variant=variant, lock_points=lock_points)
+    stats = engine.run(ops)
+    assert (stats['commits'], stats['waiting']) == (TRANSACTIONS, 0)
+    # The result stays readable once the run has finished
+    assert engine.final_result == sink.result
+    assert check(engine.final_result).conflict_serializable
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_occ_is_conflict_serializable(seed):
+    (ops, items) = schedule(seed)
+    sink = HistorySink()
+    engine = OCC(sink, retry_limit=0, items=items)
+    stats = engine.run(ops)
+    assert stats['commits'] == TRANSACTIONS
+    result = check(sink.committed())
+    assert result.conflict_serializable
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_mvcc_is_equivalent_to_timestamp_order(seed):
+    # Reads may see an older version, so the history is checked against the serial run in timestamp order
+    # instead of a single version precedence graph
+    (ops, items) = schedule(seed)
+    engine = TracedMVCC(HistorySink(), items)
+    stats = engine.run(ops)
+    assert stats['commits'] == TRANSACTIONS
+
+    seen = {}
+    for (attempt, t_num, item, writer) in engine.reads:
+        if attempt[0]:
+            seen.setdefault(t_num, []).append((item, writer))
+    expected = {}
+    last_writer = {}
+    for trx in sorted(engine.transactions.values(), key=lambda trx: trx.timestamp):
+        for op in trx.arr_process:
+            if op.operation == 'R':
+                expected.setdefault(trx.t_num, []).append((op.item, last_writer.get(op.item)))
+            elif op.operation == 'W':
+                last_writer[op.item] = trx.t_num
+    assert seen == expected
+    assert {item: versions[-1].writer for (item, versions) in engine.version_controller.map.items()
+            if versions[-1].writer is not None} == last_writer
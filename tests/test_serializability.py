@@ -0,0 +1,72 @@
+from itertools import permutations
+
+import pytest
+
+from dbcc.Parser import COMMIT, READ, ItemTable
+from dbcc.Serializability import check
+from dbcc.Workload import Workload
+
+
+def conflicts(ops):
+    '''
+        Every (earlier transaction, later transaction) pair of conflicting operations
+    '''
+    pairs = set()
+    for (i, first) in enumerate(ops):
+        for second in ops[i + 1:]:
+            if (first.t_num != second.t_num and first.item == second.item
+                    and first.kind != COMMIT and second.kind != COMMIT
+                    and (first.kind != READ or second.kind != READ)):
+                pairs.add((first.t_num, second.t_num))
+    return pairs
+
+
+def respects(order, pairs):
+    position = {t_num: index for (index, t_num) in enumerate(order)}
+    return all(position[before] < position[after] for (before, after) in pairs)
+
+
+def view(ops, order=None):
+    '''
+        Reads-from of every read and the final write of every item, of the schedule or of its serial run in order.
+        A transaction may write an item more than once, so a read is matched with the write it saw, not only its writer
+    '''
+    if order is not None:
+        ops = [op for t_num in order for op in ops if op.t_num == t_num]
+    last_writer = {}
+    reads_from = []
+    seen = {}
+    for op in ops:
+        if op.kind == COMMIT:
+            continue
+        # The n-th read or write of an item by a transaction, so operations are matched across orders
+        key = (op.kind, op.t_num, op.item, seen.get((op.kind, op.t_num, op.item), 0))
+        seen[key[:3]] = key[3] + 1
+        if op.kind == READ:
+            reads_from.append((key, last_writer.get(op.item)))
+        else:
+            last_writer[op.item] = key
+    return (sorted(reads_from, key=repr), last_writer)
+
+
+@pytest.mark.parametrize('seed', range(300))
+def test_check_matches_brute_force(seed):
+    # Mostly reads and a varying interleaving, so serializable and non serializable schedules both come up
+    workload = Workload(transactions=4, ops_per_transaction=3, read_ratio=0.7, items=3, concurrency=1 + seed % 4, seed=seed)
+    ops = list(workload.operations(ItemTable()))
+    transactions = list(dict.fromkeys(op.t_num for op in ops))
+    pairs = conflicts(ops)
+    result = check(ops)
+
+    assert result.conflict_serializable == any(respects(order, pairs) for order in permutations(transactions))
+    if result.conflict_serializable:
+        assert sorted(result.serial_order) == sorted(transactions)
+        assert respects(result.serial_order, pairs)
+    else:
+        cycle = result.cycle
+        edges = {(cycle[i], cycle[(i + 1) % len(cycle)]) for i in range(len(cycle))}
+        assert edges <= pairs
+
+    if result.view_serializable is not None:
+        schedule = view(ops)
+        assert result.view_serializable == any(view(ops, order) == schedule for order in permutations(transactions))
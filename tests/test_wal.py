@@ -0,0 +1,111 @@
+import pytest
+
+from dbcc.mvcc import MVCC
+from dbcc.Wal import WalSink, WriteAheadLog, recover
+
+
+class FailingFile:
+    '''
+    Class FailingFile, writes half of the first group it gets to the log, then fails
+    '''
+    def __init__(self, file):
+        self.file = file
+
+    def write(self, data: bytes):
+        self.file.write(data[:len(data) // 2])
+        self.file.flush()
+        raise OSError("disk full")
+
+    def close(self):
+        self.file.close()
+
+
+def test_failed_flush_keeps_the_group(tmp_path):
+    path = str(tmp_path / 'wal.log')
+    wal = WriteAheadLog(path, group_size=10, group_delay=60)
+    wal.append({'t': 1, 'w': {'X': 1}})
+    wal.append({'t': 2, 'w': {'X': 2}})
+    wal.file = FailingFile(wal.file)
+    with pytest.raises(OSError):
+        wal.flush()
+    assert (wal.buffered(), wal.durable) == (2, 1)
+
+    # The retry writes the group once, after the epoch record and without the half written one
+    third = wal.append({'t': 3, 'w': {'Y': 3}})
+    wal.flush()
+    assert wal.durable == third
+    wal.close()
+    recovery = recover(path)
+    assert (recovery.state, recovery.commits) == ({'X': 2, 'Y': 3}, 3)
+    with open(path, 'rb') as file:
+        assert len(file.read().splitlines()) == 4
+
+
+def write_log(path, lines):
+    with open(path, 'wb') as file:
+        file.write(b"".join(line.encode() + b"\n" for line in lines))
+
+
+def test_recover_drops_a_torn_record(tmp_path):
+    path = str(tmp_path / 'wal.log')
+    write_log(path, ['{"epoch":1}', '{"t":1,"w":{"X":1}}'])
+    size = len(open(path, 'rb').read())
+    with open(path, 'ab') as file:
+        file.write(b'{"t":2,"w":{"X"')
+    recovery = recover(path)
+    assert (recovery.state, recovery.epoch, recovery.size, recovery.commits) == ({'X': 1}, 1, size, 1)
+
+    # Opening the log cuts the torn record, the new epoch starts on its own line
+    WriteAheadLog(path).close()
+    recovery = recover(path)
+    assert (recovery.state, recovery.epoch, recovery.commits) == ({'X': 1}, 2, 1)
+
+
+def test_recover_applies_undo_of_a_cascade(tmp_path):
+    # T2 read the version of T1 and committed, T1 and T2 were rolled back by the cascade and committed again
+    path = str(tmp_path / 'wal.log')
+    write_log(path, ['{"epoch":1}', '{"t":2,"w":{"Y":2},"ts":2}', '{"undo":2}',
+                     '{"t":1,"w":{"X":1},"ts":5}', '{"t":2,"w":{"Y":22},"ts":6}'])
+    recovery = recover(path)
+    assert (recovery.state, recovery.commits) == ({'X': 1, 'Y': 22}, 2)
+
+    write_log(path, ['{"epoch":1}', '{"t":3,"w":{"Z":3},"ts":3}', '{"undo":3}'])
+    assert (recover(path).state, recover(path).commits) == ({}, 0)
+
+
+def test_recover_mvcc_cascade(tmp_path):
+    # T3 read the version of X written by T2 and committed, T2 is rolled back later and T3 with it.
+    # Both commit again, T2 before T3 in timestamp order but after it in the log
+    path = str(tmp_path / 'wal.log')
+    wal = WriteAheadLog(path)
+    sink = WalSink(wal)
+    engine = MVCC(sink, vacuum_threshold=0)
+    engine.run("W2(X);R3(X);W3(Z);C3;R4(Y);W2(Y);W2(Z);C2;C4".split(';'))
+    sink.close()
+    with open(path, 'rb') as file:
+        assert b'{"undo":3}' in file.read()
+    recovery = recover(path)
+    assert (recovery.state, recovery.commits) == ({'X': 2, 'Y': 2, 'Z': 3}, 2)
+
+
+def test_recover_orders_by_timestamp_then_log_order(tmp_path):
+    path = str(tmp_path / 'wal.log')
+    # The commit of T3 is logged first, T1 has the lower timestamp so its write comes first in the serial order
+    write_log(path, ['{"epoch":1}', '{"t":3,"w":{"X":3},"ts":3}', '{"t":1,"w":{"X":1},"ts":1}'])
+    assert recover(path).state == {'X': 3}
+    # Without a timestamp (OCC) the log order is the serial order
+    write_log(path, ['{"epoch":1}', '{"t":3,"w":{"X":3}}', '{"t":1,"w":{"X":1}}'])
+    assert recover(path).state == {'X': 1}
+
+
+def test_recover_across_epochs(tmp_path):
+    path = str(tmp_path / 'wal.log')
+    # Every run numbers its transactions from 1 again, a later epoch comes after whatever its timestamps are
+    # and an undo only cancels the commit of its own epoch
+    write_log(path, ['{"epoch":1}', '{"t":1,"w":{"X":1,"Y":1},"ts":9}',
+                     '{"epoch":2}', '{"t":1,"w":{"X":2},"ts":1}', '{"undo":1}', '{"t":2,"w":{"Z":2},"ts":2}'])
+    recovery = recover(path)
+    assert (recovery.state, recovery.epoch, recovery.commits) == ({'X': 1, 'Y': 1, 'Z': 2}, 2, 2)
+
+    write_log(path, ['{"epoch":1}', '{"t":1,"w":{"X":1},"ts":9}', '{"epoch":2}', '{"t":1,"w":{"X":2},"ts":1}'])
+    assert recover(path).state == {'X': 2}
@@ -0,0 +1,74 @@
+import io
+from collections import Counter
+
+import pytest
+
+from dbcc.Parser import COMMIT, READ, ItemTable, ScheduleParser
+from dbcc.Workload import Workload
+
+
+def ops(**options):
+    return list(Workload(**options).operations(ItemTable()))
+
+
+def test_same_seed_gives_the_same_schedule():
+    options = dict(transactions=50, ops_per_transaction=5, read_ratio=0.6, items=20, skew=0.9, concurrency=6, seed=7)
+    assert ops(**options) == ops(**options)
+    (first, second) = (io.StringIO(), io.StringIO())
+    Workload(**options).write(first)
+    Workload(**options).write(second)
+    assert first.getvalue() == second.getvalue()
+
+
+def test_different_seeds_give_different_schedules():
+    schedules = {tuple(ops(transactions=20, items=10, concurrency=4, seed=seed)) for seed in range(10)}
+    assert len(schedules) == 10
+
+
+@pytest.mark.parametrize('read_ratio', [0.0, 0.2, 0.5, 0.9, 1.0])
+def test_read_ratio(read_ratio):
+    schedule = ops(transactions=500, ops_per_transaction=8, read_ratio=read_ratio, items=10, seed=1)
+    kinds = Counter(op.kind for op in schedule)
+    assert kinds[COMMIT] == 500
+    reads = kinds[READ] / (500 * 8)
+    assert abs(reads - read_ratio) < 0.03
+
+
+@pytest.mark.parametrize('skew', [0.0, 1.2])
+def test_items_and_transactions_stay_in_bounds(skew):
+    items = ItemTable()
+    schedule = list(Workload(transactions=200, ops_per_transaction=3, items=7, skew=skew, concurrency=5,
+                             seed=3).operations(items))
+    assert len(items) == 7
+    touched = Counter(op.item for op in schedule if op.kind != COMMIT)
+    assert set(touched) <= set(range(7))
+    if skew:
+        # Item0 is the hottest
+        assert touched.most_common(1)[0][0] == items.intern('Item0')
+
+    # Every transaction does its reads and writes before its one commit, with at most concurrency open at once
+    per_transaction = Counter(op.t_num for op in schedule)
+    assert per_transaction == {t_num: 4 for t_num in range(1, 201)}
+    open_t_nums = set()
+    for op in schedule:
+        open_t_nums.add(op.t_num)
+        assert len(open_t_nums) <= 5
+        if op.kind == COMMIT:
+            open_t_nums.remove(op.t_num)
+    assert [op.line for op in schedule] == list(range(1, len(schedule) + 1))
+
+
+def test_written_schedule_parses_back():
+    workload = Workload(transactions=30, items=4, seed=5)
+    stream = io.StringIO()
+    workload.write(stream)
+    parser = ScheduleParser()
+    parsed = [(op.kind, op.t_num, op.item) for op in parser.parse(stream.getvalue().splitlines())]
+    assert parsed == [(op.kind, op.t_num, op.item) for op in workload.operations(parser.items)]
+
+
+@pytest.mark.parametrize('options', [dict(transactions=-1), dict(read_ratio=1.5), dict(items=0), dict(concurrency=0),
+                                     dict(skew=-1.0)])
+def test_invalid_options(options):
+    with pytest.raises(ValueError):
+        Workload(**options)